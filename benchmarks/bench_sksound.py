@@ -0,0 +1,145 @@
+"""
+Benchmarks for the time-critical parts of "sksound":
+
+    - import time of the package
+    - construction of a Sound from data
+    - reading WAV-files of different sizes, and files that require FFMPEG
+    - writing WAV-files
+    - conversion of float-data in "generate_sound"
+    - "summary"
+
+Run them from the root directory of the package with
+
+    python benchmarks/bench_sksound.py [--quick]
+
+All sound-files are synthetic, and are generated in a temporary directory.
+The benchmarks that need FFMPEG are skipped if "ffmpeg" and "ffprobe" are
+not in the system path. For each benchmark the best time of
+several repetitions is reported.
+
+"""
+
+# author:   Thomas Haslwanter
+# date:     Oct-2026
+
+import os
+import sys
+import io
+import time
+import shutil
+import argparse
+import tempfile
+import contextlib
+import subprocess
+from pathlib import Path
+
+import numpy as np
+from scipy.io import wavfile
+
+# Benchmark the source tree, not an installed version
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root_dir)
+
+from sksound.sounds import Sound
+
+
+def best_time(func, number: int=1, repeat: int=5) -> float:
+    """ Best time [sec] per call of "func", over "repeat" repetitions.
+    Output to stdout is suppressed. """
+
+    times = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            times.append((time.perf_counter() - start) / number)
+
+    return min(times)
+
+
+def import_time(module: str, repeat: int=5) -> float:
+    """ Time for importing "module" in a fresh interpreter, minus the
+    start-up time of the interpreter """
+
+    def _run(code):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], cwd=root_dir, check=True)
+        return time.perf_counter() - start
+
+    empty = min(_run('pass') for _ in range(repeat))
+    full = min(_run('import ' + module) for _ in range(repeat))
+    return full - empty
+
+
+def synthetic_sound(duration: float, rate: int=44100,
+                    num_channels: int=2) -> np.ndarray:
+    """ Stereo noise-signal, as float in the range [-1, 1] """
+
+    rng = np.random.default_rng(1234)
+    return rng.uniform(-1, 1, (int(duration*rate), num_channels))
+
+
+def main():
+    """ Run all benchmarks, and print the results """
+
+    parser = argparse.ArgumentParser(description='Benchmarks for sksound')
+    parser.add_argument('--quick', action='store_true',
+                        help='use shorter sounds, and fewer repetitions')
+    args = parser.parse_args()
+
+    rate = 44100
+    durations = [1, 10] if args.quick else [1, 10, 60]     # [sec]
+    repeat = 3 if args.quick else 5
+    results = []
+
+    for module in ['sksound', 'sksound.sounds']:
+        results.append(('import ' + module, import_time(module, repeat)))
+
+    float_data = synthetic_sound(durations[-1], rate)
+    int_data = np.int16(float_data * 2**13)
+
+    results.append(('Sound(inData=int16, {0} s)'.format(durations[-1]),
+                    best_time(lambda: Sound(inData=int_data, inRate=rate),
+                              number=100, repeat=repeat)))
+    results.append(('generate_sound(float64, {0} s)'.format(durations[-1]),
+                    best_time(lambda: Sound(inData=float_data, inRate=rate),
+                              repeat=repeat)))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_dir = Path(tmp_dir)
+
+        for duration in durations:
+            wav_file = tmp_dir / 'noise_{0}s.wav'.format(duration)
+            wavfile.write(wav_file, rate, int_data[:duration*rate])
+            results.append(('read_sound(WAV, {0} s)'.format(duration),
+                            best_time(lambda: Sound(wav_file), repeat=repeat)))
+
+        sound = Sound(inData=int_data, inRate=rate)
+        out_file = tmp_dir / 'out.wav'
+        results.append(('write_wav({0} s)'.format(durations[-1]),
+                        best_time(lambda: sound.write_wav(out_file), repeat=repeat)))
+        results.append(('summary', best_time(sound.summary, number=10,
+                                             repeat=repeat)))
+
+        ffmpeg = shutil.which('ffmpeg')
+        if None in [ffmpeg, shutil.which('ffprobe')]:
+            print('FFMPEG not found: benchmarks for MP3/FLAC are skipped.')
+        else:
+            wav_file = tmp_dir / 'noise_{0}s.wav'.format(durations[-1])
+            for ext in ['mp3', 'flac']:
+                in_file = tmp_dir / 'noise.{0}'.format(ext)
+                subprocess.run([ffmpeg, '-v', 'error', '-y', '-i', str(wav_file),
+                                str(in_file)], check=True)
+                results.append(('read_sound({0}, {1} s)'.format(ext.upper(),
+                                                               durations[-1]),
+                                best_time(lambda: Sound(in_file), repeat=repeat)))
+
+    print('{0:<36} {1:>12}'.format('Benchmark', 'Time [ms]'))
+    print('-' * 49)
+    for (name, duration) in results:
+        print('{0:<36} {1:>12.3f}'.format(name, 1000*duration))
+
+
+if __name__ == '__main__':
+    main()
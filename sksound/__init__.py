@@ -3,7 +3,8 @@
 
 Dependencies
 ------------
-numpy, scipy, json, appdirs, sounddevice
+numpy, scipy, json, appdirs
+sounddevice (optional, only for recording)
 
 Homepage
 --------
@@ -26,6 +27,15 @@ __version__ = "0.3.1"
 
 __all__ = ['misc', 'sounds']
 
-for _m in __all__:
-    importlib.import_module('.'+_m, package='sksound')
+
+# The modules are only imported when they are first accessed (PEP 562),
+# so that "import sksound" is fast
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module('.'+name, package='sksound')
+    raise AttributeError("module 'sksound' has no attribute '{0}'".format(name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
     
@@ -18,9 +18,8 @@ import os
 
 import sys
 
-import tkinter
-import tkinter.filedialog as tkf
-from tkinter import messagebox
+# "tkinter" is only imported in the dialog functions, so that the module can
+# be imported quickly, and on machines without a display
 from pathlib import Path
 import numpy as np
 from collections.abc import Generator
@@ -87,6 +86,9 @@ def get_file(filter_spec:str='*', dialog_title:str='Select File: ',
 
     """
 
+    import tkinter
+    import tkinter.filedialog as tkf
+
     root = tkinter.Tk()
     root.withdraw()
     root.attributes("-topmost", True)
@@ -127,6 +129,9 @@ def save_file(filter_spec:str='*', dialog_title:str='Save File: ',
 
     """
 
+    import tkinter
+    import tkinter.filedialog as tkf
+
     root = tkinter.Tk()
     root.withdraw()
     root.attributes("-topmost", True)
@@ -160,6 +165,9 @@ def get_dir(dialog_title:str='Select Directory',
 
     """
 
+    import tkinter
+    import tkinter.filedialog as tkf
+
     root = tkinter.Tk()
     root.withdraw()
     root.attributes("-topmost", True)
@@ -193,6 +201,9 @@ def askquestion (dialog_title:str='Interactive Selection',
 
     """
 
+    import tkinter
+    from tkinter import messagebox
+
     root = tkinter.Tk()
     root.withdraw()
 
@@ -42,15 +42,21 @@ Compatible with Python >=3.5
 
 import numpy as np
 
-from scipy.io import wavfile
 import tempfile
 import subprocess
 import json
+import hashlib
+import struct
+import threading
 import time
 from pathlib import Path
+from collections.abc import Generator
+from collections import namedtuple
+from fractions import Fraction
 
-import appdirs
-import yaml
+# "scipy.io", "appdirs", "yaml", "pygame", "sounddevice" and "concurrent.futures" are only
+# imported where they are needed, to keep "import sksound" fast. This way the
+# package also works on headless machines without a display or "pygame".
 
 # The following construct is required since I want to run the module as a script
 # inside the sksound-directory
@@ -69,14 +75,492 @@ import misc
 
 if sys.platform=='win32':
     import winsound
-elif sys.platform == 'linux':
-    import pygame
 
 
 class NoFFMPEG_Error(Exception):
     pass
 
 
+# Information about a sound, as returned by "Sound.get_info" and "probe"
+SoundInfo = namedtuple('SoundInfo', ['source', 'rate', 'numChannels',
+                                     'totalSamples', 'duration', 'dataType'])
+
+# Loudness of a sound [LUFS], as returned by "Sound.loudness"
+Loudness = namedtuple('Loudness', ['integrated', 'shortTerm', 'momentary'])
+
+
+def _sibling(command: str|os.PathLike|None, name: str) -> str|None:
+    """ Return the command "name", located in the same directory as "command" """
+
+    if command is None:
+        return None
+
+    command_dir = os.path.dirname(str(command))
+    if command_dir == '':
+        return name
+    elif sys.platform == 'win32':
+        return os.path.join(command_dir, name + '.exe')
+    else:
+        return os.path.join(command_dir, name)
+
+
+def _ffprobe(ffprobe: str|os.PathLike, in_file: str|os.PathLike) -> dict:
+    """
+    Get the properties of the first audio stream of a sound-file, with a
+    single call to "ffprobe". No samples are decoded.
+
+    Returns
+    -------
+    info : dictionary with the keys "rate", "numChannels", and "duration".
+        "duration" is "None" if it cannot be determined from the container.
+
+    Raises
+    ------
+    NoFFMPEG_Error : if "ffprobe" cannot be found
+    """
+
+    cmd = [str(ffprobe), '-v', 'error', '-select_streams', 'a:0',
+           '-show_entries', 'stream=sample_rate,channels:format=duration',
+           '-of', 'json', str(in_file)]
+    try:
+        completed_process = subprocess.run(cmd, capture_output=True, check=True)
+    except FileNotFoundError:
+        # Not a missing sound-file, which would be handled interactively
+        print('Sorry, need "ffprobe" (part of FFMPEG) for non-WAV files!')
+        raise NoFFMPEG_Error('{0} not found'.format(ffprobe))
+    probe = json.loads(completed_process.stdout)
+
+    if len(probe.get('streams', [])) == 0:
+        raise ValueError('{0} contains no audio stream!'.format(in_file))
+
+    stream = probe['streams'][0]
+    try:
+        duration = float(probe['format']['duration'])
+    except (KeyError, ValueError):
+        duration = None
+
+    return {'rate': int(stream['sample_rate']),
+            'numChannels': int(stream['channels']),
+            'duration': duration}
+
+
+def _ffmpeg_decode(ffmpeg: str|os.PathLike, in_file: str|os.PathLike,
+                   rate: int, num_channels: int,
+                   duration: float|None = None, start: float|None = None,
+                   stop: float|None = None, dtype: str = 'int16') -> np.ndarray:
+    """
+    Decode a sound-file with "ffmpeg", and read the raw PCM-data directly
+    from its stdout-pipe. No intermediate file is written.
+
+    "ffmpeg" produces the data with the given "rate", "num_channels", and
+    "dtype" ('int16' or 'float32'), so resampling and down-mixing are done
+    during the decoding.
+    The output buffer is pre-allocated from the (probed) duration, and only
+    grown if the stream turns out to be longer.
+    With "start" and/or "stop" [sec], only that part of the file is decoded,
+    using the input-seeking of "ffmpeg".
+
+    Returns
+    -------
+    data : array, with the shape (numSamples,) for mono, and
+        (numSamples, numChannels) otherwise
+    """
+
+    (raw_format, codec) = _DECODE_FORMATS[dtype]
+
+    cmd = [str(ffmpeg), '-v', 'error']
+    if start is not None:
+        cmd += ['-ss', str(start)]
+    if stop is not None:
+        cmd += ['-t', str(max(stop - (start or 0), 0))]
+    cmd += ['-i', str(in_file), '-f', raw_format, '-acodec', codec,
+            '-ar', str(int(rate)), '-ac', str(num_channels), '-']
+
+    # Expected duration of the decoded data
+    if stop is not None and (duration is None or stop < duration):
+        duration = stop
+    if duration is not None and start is not None:
+        duration = max(duration - start, 0)
+
+    if duration is None:
+        num_samples = 10 * rate
+    else:
+        # Add a small margin, since the container duration is not exact
+        num_samples = int(np.ceil(duration * rate)) + rate // 10 + 1
+
+    frame_shape = () if num_channels == 1 else (num_channels,)
+    frame_bytes = np.dtype(dtype).itemsize * num_channels
+    buffer = np.empty((num_samples,) + frame_shape, dtype=dtype)
+    num_bytes = 0
+
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE) as process:
+        while True:
+            if num_bytes == buffer.nbytes:
+                grown = np.empty((2*len(buffer),) + frame_shape, dtype=dtype)
+                grown[:len(buffer)] = buffer
+                buffer = grown
+
+            view = memoryview(buffer).cast('B')
+            num_read = process.stdout.readinto(view[num_bytes:])
+            if not num_read:
+                break
+            num_bytes += num_read
+
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, cmd)
+
+    return buffer[:num_bytes // frame_bytes]
+
+def _wav_header(rate: float, num_channels: int, dtype, num_samples: int,
+                reserve_ds64: bool = False) -> bytes:
+    """
+    Generate the RIFF/WAVE header for "num_samples" frames of integer (PCM)
+    or float (IEEE) sound data.
+
+    With "reserve_ds64", a "JUNK" chunk is inserted after "WAVE", which can
+    later be replaced by the "ds64" chunk of an RF64-file (EBU Tech 3306).
+    """
+
+    dtype = np.dtype(dtype)
+    block_align = num_channels * dtype.itemsize
+    data_size = num_samples * block_align
+    rate = int(rate)
+
+    if dtype.kind == 'f':
+        # Non-PCM formats need the "cbSize" field, and a "fact" chunk
+        fmt = struct.pack('<HHIIHHH', 3, num_channels, rate, rate*block_align,
+                          block_align, 8*dtype.itemsize, 0)
+        fact = b'fact' + struct.pack('<II', 4, num_samples)
+    else:
+        fmt = struct.pack('<HHIIHH', 1, num_channels, rate, rate*block_align,
+                          block_align, 8*dtype.itemsize)
+        fact = b''
+
+    chunks = b'fmt ' + struct.pack('<I', len(fmt)) + fmt + fact
+    if reserve_ds64:
+        chunks = b'JUNK' + struct.pack('<I', 28) + bytes(28) + chunks
+    return (b'RIFF' + struct.pack('<I', 4 + len(chunks) + 8 + data_size) +
+            b'WAVE' + chunks + b'data' + struct.pack('<I', data_size))
+
+
+def _as_int16(data: np.ndarray) -> np.ndarray:
+    """
+    Convert sound data to "int16", for audio backends that require it.
+    Integer data are shifted to the upper 16 bits; float data are expected
+    in the range [-1, 1].
+    """
+
+    if data.dtype == np.int16:
+        return data
+    elif data.dtype == np.uint8:
+        return (data.astype(np.int16) - 128) << 8
+    elif np.issubdtype(data.dtype, np.integer):
+        return (data >> (8*data.dtype.itemsize - 16)).astype(np.int16)
+    else:
+        return (np.clip(data, -1, 1) * 32767).astype(np.int16)
+
+
+# Raw FFMPEG-formats of the numpy data types (without byte order)
+_RAW_FORMATS = {'u1': 'u8', 'i2': 's16le', 'i4': 's32le',
+                'f4': 'f32le', 'f8': 'f64le'}
+
+
+# Output formats of "ffmpeg" for decoding: (raw format, codec)
+_DECODE_FORMATS = {'int16': ('s16le', 'pcm_s16le'),
+                   'float32': ('f32le', 'pcm_f32le')}
+
+
+# Possible values for the "dtype" of a Sound
+_DTYPES = (None, 'float32')
+
+
+def _to_float32(data: np.ndarray) -> np.ndarray:
+    """
+    Float data are returned as float32 (without copy, if they already are).
+    Integer data are scaled to the range [-1, 1].
+    """
+
+    if not np.issubdtype(data.dtype, np.integer):
+        return data.astype(np.float32, copy=False)
+
+    converted = data.astype(np.float32)
+    if data.dtype == np.uint8:
+        converted -= 128
+        converted *= 1/128
+    else:
+        converted *= 1/np.float32(2**(8*data.dtype.itemsize - 1))
+    return converted
+
+
+def _to_float32_into(data: np.ndarray, out: np.ndarray):
+    """
+    Like "_to_float32", but the result is written into the float32-array
+    "out" (with the shape of "data"), without temporary arrays.
+    """
+
+    if not np.issubdtype(data.dtype, np.integer):
+        np.copyto(out, data, casting='unsafe')
+    elif data.dtype == np.uint8:
+        np.subtract(data, np.float32(128), out=out, casting='unsafe')
+        out *= 1/np.float32(128)
+    else:
+        np.multiply(data, 1/np.float32(2**(8*data.dtype.itemsize - 1)), out=out,
+                    casting='unsafe')
+
+
+def _read_wav_header(fid) -> dict:
+    """
+    Parse the RIFF/WAVE (or RF64) header of an open (binary) WAV-file. No
+    samples are read; on return, "fid" is positioned at the start of the
+    sample data.
+
+    Returns
+    -------
+    info : dictionary with the keys "rate", "numChannels", "totalSamples",
+        "dataType" (dtype of the samples in memory), "sampleWidth" (bytes per
+        sample in the file), and "dataOffset" (byte offset of the samples)
+
+    Notes
+    -----
+    24-bit data are returned as "int32", with the samples in the upper three
+    bytes (the same convention as "scipy.io.wavfile.read").
+    """
+
+    riff_id = fid.read(4)
+    if riff_id not in (b'RIFF', b'RF64'):
+        raise ValueError('Not a RIFF/WAVE file!')
+    fid.read(4)
+    if fid.read(4) != b'WAVE':
+        raise ValueError('Not a RIFF/WAVE file!')
+
+    fmt = None
+    data_size64 = None
+    while True:
+        chunk_header = fid.read(8)
+        if len(chunk_header) < 8:
+            raise ValueError('No "data" chunk found!')
+        chunk_id, chunk_size = struct.unpack('<4sI', chunk_header)
+
+        if chunk_id == b'fmt ':
+            fmt_data = fid.read(chunk_size)
+            (format_tag, num_channels, rate, _, block_align,
+             bits_per_sample) = struct.unpack('<HHIIHH', fmt_data[:16])
+
+            # WAVE_FORMAT_EXTENSIBLE: the format is in the sub-format GUID
+            if format_tag == 0xFFFE and len(fmt_data) >= 26:
+                format_tag = struct.unpack('<H', fmt_data[24:26])[0]
+            fmt = (format_tag, num_channels, rate, block_align, bits_per_sample)
+
+        elif chunk_id == b'ds64':
+            # RF64: the 64-bit sizes replace the 32-bit ones
+            ds64_data = fid.read(chunk_size)
+            data_size64 = struct.unpack('<Q', ds64_data[8:16])[0]
+
+        elif chunk_id == b'data':
+            if fmt is None:
+                raise ValueError('No "fmt " chunk before the "data" chunk!')
+            if riff_id == b'RF64' and data_size64 is not None:
+                chunk_size = data_size64
+            break
+
+        else:
+            fid.seek(chunk_size, 1)
+
+        # Chunks are word-aligned
+        if chunk_size % 2:
+            fid.seek(1, 1)
+
+    (format_tag, num_channels, rate, block_align, bits_per_sample) = fmt
+    sample_width = bits_per_sample // 8
+    if format_tag == 1 and sample_width in (1, 2, 3, 4, 8):
+        dtype = {1:np.uint8, 2:np.int16, 3:np.int32, 4:np.int32, 8:np.int64}[sample_width]
+    elif format_tag == 3 and sample_width in (4, 8):
+        dtype = {4:np.float32, 8:np.float64}[sample_width]
+    else:
+        raise ValueError('Unsupported WAV format (tag {0}, {1} bits)!'.format(
+            format_tag, bits_per_sample))
+
+    # Streaming writers may leave the size of the "data" chunk open
+    data_offset = fid.tell()
+    data_size = min(chunk_size, os.fstat(fid.fileno()).st_size - data_offset)
+
+    return {'rate': rate,
+            'numChannels': num_channels,
+            'totalSamples': data_size // block_align,
+            'dataType': str(np.dtype(dtype)),
+            'sampleWidth': sample_width,
+            'dataOffset': data_offset}
+
+
+def _sample_range(start: float|None, stop: float|None, rate: float,
+                  total_samples: int) -> tuple[int, int]:
+    """ First and last (exclusive) sample of the interval [start, stop) [sec] """
+
+    first = 0 if start is None else int(round(start * rate))
+    last = total_samples if stop is None else int(round(stop * rate))
+    first = min(max(first, 0), total_samples)
+    last = min(max(last, first), total_samples)
+    return (first, last)
+
+
+def _read_wav_excerpt(in_file: str|os.PathLike, start: float|None,
+                      stop: float|None) -> tuple[int, np.ndarray]:
+    """
+    Read the samples between "start" and "stop" [sec] from a WAV-file. The
+    file position is computed from the header, so only the requested part
+    of the file is read.
+
+    Returns
+    -------
+    (rate, data) : sample rate, and data (in the same format as from
+        "scipy.io.wavfile.read")
+    """
+
+    with open(in_file, 'rb') as fid:
+        header = _read_wav_header(fid)
+        (first, last) = _sample_range(start, stop, header['rate'],
+                                      header['totalSamples'])
+
+        num_channels = header['numChannels']
+        frame_shape = () if num_channels == 1 else (num_channels,)
+        fid.seek(header['dataOffset'] + first * num_channels * header['sampleWidth'])
+
+        data = np.empty((last-first,) + frame_shape, dtype=header['dataType'])
+        num_frames = _read_frames(fid, data, header['sampleWidth'])
+
+    return (header['rate'], data[:num_frames])
+
+
+def _read_frames(fid, out: np.ndarray, sample_width: int) -> int:
+    """
+    Fill "out" with frames read from the binary stream "fid" (a file or a
+    pipe). Returns the number of complete frames read; this is less than
+    "len(out)" only at the end of the stream.
+    """
+
+    if len(out) == 0:
+        return 0
+
+    frame_bytes = out[:1].nbytes // out.itemsize * sample_width
+
+    if sample_width == 3:
+        # 24-bit samples are stored in the upper three bytes of an "int32"
+        raw = fid.read(len(out) * frame_bytes)
+        num_frames = len(raw) // frame_bytes
+        samples = np.frombuffer(raw, dtype=np.uint8,
+                                count=num_frames*frame_bytes).reshape(-1, 3)
+        as_bytes = out[:num_frames].reshape(-1).view(np.uint8).reshape(-1, 4)
+        as_bytes[:, 0] = 0
+        as_bytes[:, 1:] = samples
+        return num_frames
+
+    view = memoryview(out).cast('B')
+    num_bytes = 0
+    while num_bytes < view.nbytes:
+        num_read = fid.readinto(view[num_bytes:])
+        if not num_read:
+            break
+        num_bytes += num_read
+
+    return num_bytes // frame_bytes
+
+
+def _iter_stream(fid, frame_shape: tuple, dtype, sample_width: int,
+                 block_size: int, hop: int,
+                 max_frames: int|None = None) -> Generator:
+    """
+    Yield blocks of "block_size" frames from the binary stream "fid", with
+    the start of consecutive blocks "hop" frames apart. The last block can
+    be shorter. Only the current block, and the overlap with the previous
+    one, are kept in memory.
+    """
+
+    overlap = max(block_size - hop, 0)
+    skip = max(hop - block_size, 0)
+    frame_bytes = int(np.prod(frame_shape, dtype=int)) * sample_width
+    remaining = np.inf if max_frames is None else max_frames
+    previous = None
+
+    while True:
+        block = np.empty((block_size,) + frame_shape, dtype=dtype)
+
+        if previous is None:
+            num_old = 0
+        else:
+            if skip > 0:
+                num_skip = int(min(skip, remaining))
+                if fid.seekable():
+                    fid.seek(num_skip * frame_bytes, 1)
+                else:
+                    # Pipes cannot seek: read and discard, one block at a time
+                    scratch = np.empty((min(num_skip, block_size),) + frame_shape,
+                                       dtype=dtype)
+                    num_skipped = 0
+                    while num_skipped < num_skip:
+                        num_read = _read_frames(
+                            fid, scratch[:num_skip-num_skipped], sample_width)
+                        if num_read == 0:
+                            break
+                        num_skipped += num_read
+                    num_skip = num_skipped
+                remaining -= num_skip
+            block[:overlap] = previous[hop:]
+            num_old = overlap
+
+        num_new = int(min(block_size - num_old, remaining))
+        num_new = _read_frames(fid, block[num_old:num_old+num_new], sample_width)
+        remaining -= num_new
+
+        if num_new == 0:
+            return
+
+        num_frames = num_old + num_new
+        if num_frames < block_size:
+            yield block[:num_frames]
+            return
+
+        yield block
+        previous = block
+
+
+def _import_pygame():
+    """ Import "pygame" when it is first needed, without its banner """
+
+    os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+    import pygame
+    return pygame
+
+
+# Settings of the pygame mixer, which is shared by all Sound objects
+_mixer_settings = None
+_mixer_lock = threading.Lock()
+
+
+def _init_mixer(rate: float, num_channels: int, exact: bool = True):
+    """
+    Initialize the pygame mixer (and no other pygame subsystem) on the
+    first call, and keep it for later calls. It is only re-initialized if
+    "exact" is set, and the sample rate or number of channels differ.
+
+    Note that re-initializing the mixer stops sounds that are playing.
+    """
+
+    global _mixer_settings
+
+    pygame = _import_pygame()
+    settings = (int(rate), int(num_channels))
+    with _mixer_lock:
+        if pygame.mixer.get_init() is not None:
+            if not exact or settings == _mixer_settings:
+                return
+            pygame.mixer.quit()
+
+        # With "allowedchanges=0", SDL converts to the device format
+        pygame.mixer.init(frequency=settings[0], size=-16,
+                          channels=settings[1], allowedchanges=0)
+        _mixer_settings = settings
+
+
 class FFMPEG_info:
     """
 
@@ -90,18 +574,48 @@ class FFMPEG_info:
         - config_file : JSON-file, with the config-information
         - ffmpeg : Commandline location of the command "ffmpeg"
         - ffplay : Commandline location of the command "ffplay"
+        - ffprobe : Commandline location of the command "ffprobe"
 
+    The discovery is done only once per process, if the object is obtained
+    with "FFMPEG_info.cached()". After changes to the FFMPEG installation,
+    call "FFMPEG_info.clear_cache()" (this is done automatically by "set").
 
     """
 
+    # Process-wide instance, returned by "FFMPEG_info.cached"
+    _cached = None
+    # Re-entrant, since the discovery in "__init__" may call "set", which
+    # calls "clear_cache"
+    _cache_lock = threading.RLock()
+
+    @classmethod
+    def cached(cls) -> 'FFMPEG_info':
+        """ Return the process-wide FFMPEG_info, and create it on the first call """
+
+        with cls._cache_lock:
+            if cls._cached is None:
+                cls._cached = cls()
+            return cls._cached
+
+
+    @classmethod
+    def clear_cache(cls):
+        """ Discard the process-wide FFMPEG_info; the next call to "cached"
+        reads the config-information again """
+
+        with cls._cache_lock:
+            cls._cached = None
+
+
     def __init__(self):
         """Set the name of the config-file, and the properties
-        "ffmpeg" and "ffplay" of the FFMPEG_info object"""
+        "ffmpeg", "ffplay" and "ffprobe" of the FFMPEG_info object"""
 
         app_name = 'FFMPEG_info'
         app_author = 'sksound'
 
         # The package "appdirs" allows an OS-independent implementation
+        import appdirs
         user_data_dir = appdirs.user_data_dir(app_name, app_author)
         if not os.path.exists(user_data_dir):
             os.makedirs(user_data_dir)
@@ -114,9 +628,11 @@ class FFMPEG_info:
                 completed_process = subprocess.run(
                     'ffmpeg', stderr=subprocess.DEVNULL)
                 completed_process = subprocess.run('ffplay', stderr=subprocess.DEVNULL)
+                completed_process = subprocess.run('ffprobe', stderr=subprocess.DEVNULL)
 
                 self.ffmpeg = 'ffmpeg'
                 self.ffplay = 'ffplay'
+                self.ffprobe = 'ffprobe'
             except FileNotFoundError:
                 self.set()
         else:
@@ -125,28 +641,34 @@ class FFMPEG_info:
                 self.ffmpeg = info['ffmpeg']
                 self.ffplay = info['ffplay']
 
+                # Config-files from older versions have no entry for "ffprobe"
+                # It is installed together with "ffmpeg", so look for it there
+                self.ffprobe = info.get('ffprobe', _sibling(self.ffmpeg, 'ffprobe'))
+
 
     def set(self):
         """
         Set the config-filename, and write the FFMPEG_info
-        properties "ffmpeg" and "ffplay" to that config-file.
+        properties "ffmpeg", "ffplay" and "ffprobe" to that config-file.
 
         If FFMPEG is not installed, these are set to "None".
         """
 
-        ffmpeg_installed = misc.askquestion(DialogTitle='FFMPEG Check',
+        ffmpeg_installed = misc.askquestion(dialog_title='FFMPEG Check',
                                            Question='Is FFMPEG installed?')
 
         if ffmpeg_installed:
-            ffmpeg_dir = misc.get_dir(DialogTitle='Please select the directory where FFMPEG (binary) is installed:')
+            ffmpeg_dir = misc.get_dir(dialog_title='Please select the directory where FFMPEG (binary) is installed:')
 
 
             if sys.platform=='win32':
                 self.ffmpeg = ffmpeg_dir/'ffmpeg.exe'
                 self.ffplay = ffmpeg_dir/'ffplay.exe'
+                self.ffprobe = ffmpeg_dir/'ffprobe.exe'
             else:
                 self.ffmpeg = ffmpeg_dir/'ffmpeg'
                 self.ffplay = ffmpeg_dir/'ffplay'
+                self.ffprobe = ffmpeg_dir/'ffprobe'
 
             if not os.path.exists(self.ffmpeg):
                 print('Sorry, {0} does not exist!'.format(self.ffmpeg))
@@ -156,12 +678,18 @@ class FFMPEG_info:
                 print('Sorry, {0} does not exist!'.format(self.ffplay))
                 return
 
+            if not os.path.exists(self.ffprobe):
+                print('Sorry, {0} does not exist!'.format(self.ffprobe))
+                return
+
         else:
             self.ffmpeg = None
             self.ffplay = None
+            self.ffprobe = None
 
         # Save them to the default config file
-        info = {'ffmpeg':self.ffmpeg, 'ffplay': self.ffplay}
+        info = {name: (None if path is None else str(path)) for (name, path) in
+                [('ffmpeg', self.ffmpeg), ('ffplay', self.ffplay), ('ffprobe', self.ffprobe)]}
         try:
             with open(self.config_file, 'w') as outFile:
                 json.dump(info, outFile)
@@ -171,9 +699,256 @@ class FFMPEG_info:
             print('Current directory: {0}'.format(curDir))
             print('Error: {0}'.format(e))
 
+        FFMPEG_info.clear_cache()
         return
 
 
+class DecodeCache:
+    """
+
+    On-disk cache for the decoded sound data of non-WAV files.
+
+    Each entry is stored as ".npy"-file, and is keyed on the path, size and
+    modification time of the sound-file, and on the decoding parameters.
+    Cached data are opened as read-only memory-maps, so a warm load needs
+    no FFMPEG call. When the total size exceeds "max_size", the least
+    recently used entries are deleted.
+
+    Parameters
+    ----------
+    cache_dir : directory of the cache. Default is the user cache directory
+        of "sksound", next to the config-information of FFMPEG_info.
+    max_size : maximum total size of the cache [bytes]. Larger files are
+        not cached.
+
+    Examples
+    --------
+    >>> from sksound.sounds import Sound, DecodeCache
+    >>> mySound = Sound('test.mp3', cache=True)             # default cache
+    >>> myCache = DecodeCache('/scratch/decoded', max_size=50*2**30)
+    >>> mySound = Sound('test.mp3', cache=myCache)
+
+    """
+
+    # Process-wide default cache, returned by "DecodeCache.default"
+    _default = None
+
+    def __init__(self, cache_dir: str|os.PathLike|None = None,
+                 max_size: int = 2**31):
+        """ Set the cache directory, and create it if necessary """
+
+        if cache_dir is None:
+            import appdirs
+            cache_dir = os.path.join(appdirs.user_cache_dir('FFMPEG_info', 'sksound'),
+                                     'decoded')
+        self.cache_dir = Path(cache_dir)
+        self.max_size = max_size
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+
+    @classmethod
+    def default(cls) -> 'DecodeCache':
+        """ Return the process-wide default cache, and create it on the first call """
+
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+
+    def _key(self, in_file: str|os.PathLike, params: dict) -> str:
+        """ Key of a cache entry, from the file properties and the decoding parameters """
+
+        stat = os.stat(in_file)
+        description = json.dumps([os.path.abspath(in_file), stat.st_size,
+                                  stat.st_mtime_ns, params], sort_keys=True)
+        return hashlib.sha1(description.encode()).hexdigest()
+
+
+    def load(self, in_file: str|os.PathLike, params: dict) -> tuple|None:
+        """
+        Look up the decoded data of a sound-file.
+
+        Returns
+        -------
+        (rate, data) : sample rate, and read-only memory-mapped data; or
+            "None" if the file is not in the cache
+        """
+
+        key = self._key(in_file, params)
+        for entry in self.cache_dir.glob(key + '_*.npy'):
+            try:
+                data = np.load(entry, mmap_mode='r')
+                # Mark the entry as recently used
+                os.utime(entry)
+            except (OSError, ValueError):
+                # Entry deleted, or damaged
+                continue
+            rate = int(entry.stem.split('_')[-1])
+            return (rate, data)
+
+        return None
+
+
+    def store(self, in_file: str|os.PathLike, params: dict, rate: int,
+              data: np.ndarray):
+        """ Save the decoded data of a sound-file, and evict old entries if
+        the cache becomes too large. Data larger than "max_size" are not
+        stored, since they would evict all other entries, and then
+        themselves. """
+
+        if data.nbytes > self.max_size:
+            return
+
+        key = self._key(in_file, params)
+        entry = self.cache_dir / '{0}_{1}.npy'.format(key, int(rate))
+
+        # Write to a temporary file first, so that other processes never see
+        # incomplete entries
+        tmp_file = tempfile.NamedTemporaryFile(dir=self.cache_dir, suffix='.tmp',
+                                               delete=False)
+        try:
+            with tmp_file:
+                np.save(tmp_file, data)
+            os.replace(tmp_file.name, entry)
+        except BaseException:
+            # E.g. disk full, or interrupted: don't leave the partial file behind
+            try:
+                os.unlink(tmp_file.name)
+            except OSError:
+                pass
+            raise
+
+        self._evict()
+
+
+    def clear(self):
+        """ Delete all cache entries, and left-over temporary files """
+
+        for entry in list(self.cache_dir.glob('*.npy')) + list(self.cache_dir.glob('*.tmp')):
+            try:
+                entry.unlink()
+            except OSError:
+                pass
+
+
+    def _evict(self):
+        """ Delete the least recently used entries, until the cache is
+        smaller than "max_size" """
+
+        # Temporary files of writes that were aborted (e.g. when the process
+        # was killed) are removed after an hour
+        for tmp_file in self.cache_dir.glob('*.tmp'):
+            try:
+                if time.time() - tmp_file.stat().st_mtime > 3600:
+                    tmp_file.unlink()
+            except OSError:
+                continue
+
+        entries = []
+        for entry in self.cache_dir.glob('*.npy'):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+
+        total_size = sum([size for (_, size, _) in entries])
+        for (_, size, entry) in sorted(entries, key=lambda item: item[0]):
+            if total_size <= self.max_size:
+                break
+            try:
+                entry.unlink()
+            except OSError:
+                # E.g. still opened by another process (on Windows)
+                continue
+            total_size -= size
+
+
+class Playback:
+    """
+
+    Handle to a sound that is being played, returned by "Sound.play".
+
+    Parameters
+    ----------
+    duration : duration of the sound [sec]
+    is_busy : function that returns "True" while the sound is playing. If
+        "None", the end of the sound is determined from the duration.
+    stop : function that stops the sound
+    resource : object that has to be kept alive during the playback
+
+    Notes
+    -----
+    PlaybackProperties:
+        - is_playing
+
+    PlaybackMethods:
+        - stop
+        - wait
+
+    Examples
+    --------
+    >>> mySound = Sound('test.wav')
+    >>> playback = mySound.play(blocking=False)
+    >>> playback.wait(timeout=1)    # play at most 1 sec ...
+    >>> playback.stop()             # ... and then stop the sound
+
+    """
+
+    def __init__(self, duration: float, is_busy=None, stop=None, resource=None):
+        """ Store the functions for checking and stopping the playback """
+
+        self._end_time = time.monotonic() + duration
+        self._is_busy = is_busy
+        self._stop = stop
+        self._resource = resource
+        self._stopped = False
+
+
+    @property
+    def is_playing(self) -> bool:
+        """ True, as long as the sound is playing """
+
+        if self._stopped:
+            return False
+        elif self._is_busy is not None:
+            return bool(self._is_busy())
+        else:
+            return time.monotonic() < self._end_time
+
+
+    def wait(self, timeout: float|None = None) -> bool:
+        """
+        Wait until the sound has finished.
+
+        Parameters
+        ----------
+        timeout : maximum waiting time [sec]. If "None", wait until the end.
+
+        Returns
+        -------
+        finished : True if the sound has finished, False after a timeout
+        """
+
+        if timeout is not None:
+            give_up = time.monotonic() + timeout
+
+        while self.is_playing:
+            if timeout is not None and time.monotonic() >= give_up:
+                return False
+            time.sleep(0.01)
+
+        return True
+
+
+    def stop(self):
+        """ Stop the sound """
+
+        if self.is_playing and self._stop is not None:
+            self._stop()
+        self._stopped = True
+
+
 class Sound:
     """
 
@@ -193,6 +968,23 @@ class Sound:
         manually generated sound data; requires "inRate" to be set, too.
     inRate: integer
         sample rate; required if "inData" are entered.
+    mmap: boolean
+        if True, the data of a WAV-file are memory-mapped (read-only),
+        instead of being read into memory.
+    dtype: None or 'float32'
+        with 'float32', the data are kept as float32 (integer data are
+        scaled to the range [-1, 1]). By default, float data are converted
+        to int16. Conversion to integers is then only done for playback, if
+        the audio backend requires it.
+    cache: boolean or DecodeCache
+        if set, decoded non-WAV files are kept in an on-disk cache (True
+        uses the default DecodeCache), so later reads need no FFMPEG call.
+    start, stop: float
+        if given, only the part of the file between "start" and "stop" [sec]
+        is read.
+    rate, channels: sample rate and number of channels of the data read
+        from "inFile". For non-WAV files the conversion is done by FFMPEG
+        during the decoding. Default is the format of the file.
 
     Returns
     -------
@@ -201,9 +993,8 @@ class Sound:
 
     Notes
     -----
-    For non WAV-files, the file is first converted to WAV using
-    FFMPEG, and then read in. A warning is generated, to avoid
-    unintentional deletion of existing WAV-files.
+    Non WAV-files are decoded with FFMPEG, and read directly from the
+    FFMPEG output-pipe. Nothing is written to the disk.
 
     SoundProperties:
         - source
@@ -215,11 +1006,23 @@ class Sound:
         - bitsPerSample
 
     SoundMethods:
+        - clear_cache
         - generate_sound
         - get_info
+        - iter_blocks
+        - loudness
+        - open_writer
+        - peak
         - play
+        - process
         - read_sound
+        - record
+        - resample
+        - rms
+        - spectrogram
+        - stft
         - summary
+        - write
         - write_wav
 
     Examples
@@ -240,18 +1043,28 @@ class Sound:
     """
 
     def __init__(self, inFile: str|os.PathLike = '', inData: np.ndarray|None = None, inRate:
-                 float|None = None):
+                 float|None = None, mmap: bool = False, dtype: str|None = None,
+                 cache: 'bool|DecodeCache' = False, start: float|None = None,
+                 stop: float|None = None, rate: float|None = None,
+                 channels: int|None = None):
         """ Initialize a Sound object """
 
-        # Information about FFMPEG
-        self.ffmpeg_info = FFMPEG_info()
+        # Information about FFMPEG: only looked up when it is needed, so
+        # sounds generated from "inData" skip the FFMPEG discovery
+        self._ffmpeg_info = None
+
+        if dtype not in _DTYPES:
+            raise ValueError('"dtype" has to be one of {0}!'.format(_DTYPES))
 
         #self.data = np.empty(0)
         if inData is not None:
             if inRate is None:
                 print('Set the "rate" to the default value (8012 Hz).')
                 rate = 8012.0
-            self.generate_sound(inData, inRate)
+            if dtype == 'float32':
+                self.generate_sound(_to_float32(inData), inRate, fmt=None)
+            else:
+                self.generate_sound(inData, inRate)
         else:
             if inFile == '':
                 inFile = self._selectInput()
@@ -259,15 +1072,34 @@ class Sound:
                     return
             try:
                 self.source = str(inFile)
-                self.read_sound(self.source)
+                self.read_sound(self.source, mmap=mmap, dtype=dtype, cache=cache,
+                                start=start, stop=stop, rate=rate, channels=channels)
             except FileNotFoundError as err:
                 print(err)
                 inFile = self._selectInput()
                 self.source = inFile
-                self.read_sound(self.source)
+                self.read_sound(self.source, mmap=mmap, dtype=dtype, cache=cache,
+                                start=start, stop=stop, rate=rate, channels=channels)
+
+
+    @property
+    def ffmpeg_info(self) -> FFMPEG_info:
+        """ Information about FFMPEG, shared by all Sound objects """
 
+        if self._ffmpeg_info is None:
+            self._ffmpeg_info = FFMPEG_info.cached()
+        return self._ffmpeg_info
 
-    def read_sound(self, inFile):
+
+    @ffmpeg_info.setter
+    def ffmpeg_info(self, info: FFMPEG_info):
+        self._ffmpeg_info = info
+
+
+    def read_sound(self, inFile, mmap: bool = False, dtype: str|None = None,
+                   cache: 'bool|DecodeCache' = False, start: float|None = None,
+                   stop: float|None = None, rate: float|None = None,
+                   channels: int|None = None):
         """
 
         Read data from a sound-file.
@@ -276,6 +1108,22 @@ class Sound:
         ----------
         inFile : string
             path- and file-name of infile
+        mmap : if True, WAV-data are not read into memory, but memory-mapped
+            as a read-only array. Only possible for WAV-files.
+        dtype : None or 'float32'. With 'float32', float data are kept as
+            they are, and integer data are scaled to float32 in the range
+            [-1, 1]. By default, float data are converted to int16.
+        cache : for non-WAV files: if True, the default DecodeCache is used;
+            a DecodeCache object selects a specific cache. Data loaded from
+            the cache are read-only memory-maps.
+        start : beginning of the part of the file that is read [sec]. Default
+            is the start of the file.
+        stop : end of the part of the file that is read [sec]. Default is the
+            end of the file.
+        rate : sample rate of the data (rounded to an integer). Default is
+            the rate of the file.
+        channels : number of channels of the data. Default is the number of
+            channels of the file.
 
         Returns
         -------
@@ -284,122 +1132,200 @@ class Sound:
 
         Notes
         -----
-        * For non WAV-files, the file is first converted to WAV using
-          FFMPEG, and then read in.
+        * For non WAV-files, the file is decoded by FFMPEG, and the PCM-data
+          are read directly from the FFMPEG-pipe. No WAV-file is written.
+          Sample rate and number of channels are obtained with "ffprobe".
         * If FFMPEG is not installed, non-WAV files produce a "sounds.NoFFMPEG_Error"
+        * With "mmap=True", the data are shared with all other processes that
+          map the same file, through the page cache. Float-data are then
+          kept as they are, since the conversion to integer would require
+          a copy. Memory-mapping does not work for 24-bit WAV-files.
+        * With "start"/"stop", WAV-files are read from the byte-position
+          computed from the header, and other formats are decoded with the
+          input-seeking of FFMPEG. Only the requested excerpt is read.
+        * For non-WAV files, FFMPEG directly produces data with the requested
+          "rate", "channels" and "dtype". For WAV-files the conversion is
+          done after reading, with "resample" and by averaging/duplicating
+          the channels.
 
         Examples
         --------
         >>> mySound = Sound('test.wav')
         >>> mySound.play()
         >>> mySound.read_sound('test2.wav') # If you want to read in another(!) file
+        >>> bigSound = Sound('long_recording.wav', mmap=True)
+        >>> excerpt = Sound('long_recording.mp3', start=600, stop=602)
+        >>> speech = Sound('interview.m4a', rate=16000, channels=1, dtype='float32')
 
         """
 
-        # Python can natively only read "wav" files. To be flexible, use "ffmpeg" for conversion for other formats
+        # Python can natively only read "wav" files. To be flexible, use "ffmpeg" for decoding other formats
         if not os.path.exists(inFile):
             print('{0} does not exist!'.format(inFile))
             raise FileNotFoundError
 
         (root, ext) = os.path.splitext(inFile)
-        if ext[1:].lower() != 'wav':
+        if mmap and ext[1:].lower() != 'wav':
+            raise ValueError('Memory-mapping is only possible for WAV-files!')
+
+        # FFMPEG, the decode-cache, and the WAV-header need integer rates
+        if rate is not None:
+            rate = int(round(rate))
+
+        if cache is True:
+            cache = DecodeCache.default()
+        decode_dtype = 'float32' if dtype == 'float32' else 'int16'
+        decode_params = {'format': _DECODE_FORMATS[decode_dtype][0],
+                         'start': start, 'stop': stop,
+                         'rate': rate, 'channels': channels}
+        cached = None
+        if cache and ext[1:].lower() != 'wav':
+            cached = cache.load(inFile, decode_params)
+
+        if cached is not None:
+            (self.rate, self.data) = cached
+            print('Infile loaded from the decode-cache')
+
+        elif ext[1:].lower() != 'wav':
             if self.ffmpeg_info.ffmpeg == None:
                 print('Sorry, need FFMPEG for non-WAV files!')
                 self.rate = None
                 self.data = None
                 raise NoFFMPEG_Error
 
-            outFile = root + '.wav'
-            cmd = [self.ffmpeg_info.ffmpeg, '-i', inFile, outFile, '-y']
-            subprocess.run(cmd)
-            print('Infile converted from ' + ext + ' to ".wav"')
-
-            inFile = outFile
-            self.source = outFile
-
-        self.rate, self.data = wavfile.read(inFile)
+            # Get the rate and number of channels, then stream the decoded
+            # PCM-data from "ffmpeg" directly into memory
+            stream_info = _ffprobe(self.ffmpeg_info.ffprobe, inFile)
+            self.rate = stream_info['rate'] if rate is None else rate
+            num_channels = stream_info['numChannels'] if channels is None else channels
+            self.data = _ffmpeg_decode(self.ffmpeg_info.ffmpeg, inFile,
+                                       self.rate, num_channels,
+                                       stream_info['duration'], start, stop,
+                                       decode_dtype)
+            print('Infile decoded from ' + ext)
+
+            if cache:
+                cache.store(inFile, decode_params, self.rate, self.data)
+        elif mmap:
+            from scipy.io import wavfile
+            self.rate, self.data = wavfile.read(inFile, mmap=True)
+            self.data.flags.writeable = False
+            (first, last) = _sample_range(start, stop, self.rate, len(self.data))
+            self.data = self.data[first:last]
+        elif start is not None or stop is not None:
+            self.rate, self.data = _read_wav_excerpt(inFile, start, stop)
+        else:
+            from scipy.io import wavfile
+            self.rate, self.data = wavfile.read(inFile)
 
         # Set the filename
         self.source = inFile
 
+        # An excerpt has to be played from memory, not from the source-file
+        self._source_complete = start is None and stop is None
+
         # Make sure that the data are in some integer format
         # Otherwise, e.g. Windows has difficulty playing the sound
         # Note that "self.source" is set to "None", in order to
         # play the correct, converted file with "play"
-        if not np.issubdtype(self.data.dtype, np.integer):
+        # (With "dtype='float32'" the conversion is only done for playback)
+        if dtype == 'float32':
+            self.data = _to_float32(self.data)
+        elif not mmap and not np.issubdtype(self.data.dtype, np.integer):
             self.generate_sound(self.data, self.rate)
 
         self._setInfo()
+
+        # For WAV-files, the conversion to the requested number of channels
+        # and rate is done here (for other formats already by FFMPEG)
+        if channels is not None and channels != self.numChannels:
+            self._set_channels(channels)
+        if rate is not None and rate != self.rate:
+            self.resample(rate)
+
         print('data read in!')
 
 
-    def play(self):
+    def _set_channels(self, channels: int):
+        """ Down-mix the data to mono, or duplicate mono data to "channels" channels """
+
+        if channels == 1:
+            mixed = np.mean(self.data, axis=1)
+            self.data = _cast_like(mixed, self.data.dtype)
+        elif self.numChannels == 1:
+            self.data = np.repeat(self.data[:, np.newaxis], channels, axis=1)
+        else:
+            raise ValueError('Cannot convert {0} channels to {1}!'.format(
+                self.numChannels, channels))
+
+        self._source_complete = False
+        self._setInfo()
+
+
+    def play(self, blocking: bool = True) -> 'Playback|None':
         """
        Play the stored sound
 
        Parameters
        ----------
-       None :
+       blocking : if True (default), return only after the sound has been
+           played. Otherwise, return immediately.
 
        Returns
        -------
-       None :
+       playback : Playback
+           Handle to the playing sound, with the methods "wait" and "stop",
+           and the property "is_playing".
 
 
        Notes
        -----
        On "Windows" the module "winsound" is used; on "Linux" I use
        "pygame"; and on "OSX" the terminal command "afplay".
+       Sounds without a source-file are played from memory, without writing
+       a temporary file (on "OSX" this requires "ffplay").
+       On "Linux" only the mixer of "pygame" is initialized, once, and it is
+       re-used by all later calls. It is only re-initialized when a sound
+       with a different sample rate or number of channels is played from
+       memory; this stops other sounds that are still playing.
 
        Examples
        --------
        >>> mySound = Sound('test.wav')
        >>> mySound.play()
+       >>> playback = mySound.play(blocking=False)
+       >>> # ... do something else ...
+       >>> if playback.is_playing:
+       >>>     playback.stop()
 
         """
 
-        try:
-            if self.source is None:
-                # If there is no source-file, write the data to a temporary WAV-file ...
-                tmpFile = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-                tmpFile.close()
-                self.write_wav(Path(tmpFile.name))
-
-                # ... and play that file
-                if sys.platform=='win32':
-                    winsound.PlaySound(tmpFile.name, winsound.SND_FILENAME)
-                elif sys.platform == 'darwin':
-                    cmd = ['afplay', tmpFile.name]
-                    subprocess.run(cmd)
-                else:
-                    pygame.init()
-                    pygame.mixer.music.load(tmpFile.name)
-                    pygame.mixer.music.play()
-                    time.sleep(self.duration)
+        # Excerpts and decoded non-WAV files are played from memory, since
+        # not all backends can play compressed formats. "winsound" can only
+        # play integer WAV-files
+        play_data = (self.source is None or not self._source_complete or
+                     os.path.splitext(str(self.source))[1].lower() != '.wav' or
+                     (sys.platform == 'win32' and
+                      not np.issubdtype(self.data.dtype, np.integer)))
 
-                    # If you want to use FFMPEG instead, use the following commands:
-                    #cmd = [self.ffmpeg_info.ffplay, '-autoexit', '-nodisp', '-i', tmpFile.name]
-                    #subprocess.run(cmd)
+        try:
+            if play_data:
+                # If there is no (playable) source-file, play the data directly from memory
+                playback = self._play_data()
 
             elif os.path.exists(self.source):
                 # If you have a given input file ...
                 print('Playing ' + str(self.source))
 
                 # ... then play that one
-                if sys.platform == 'win32':
-                    winsound.PlaySound(str(self.source), winsound.SND_FILENAME)
-                elif sys.platform == 'darwin':
-                    cmd = ['afplay', str(self.source)]
-                    subprocess.run(cmd)
-                else:
-                    pygame.init()
-                    pygame.mixer.music.load(self.source)
-                    pygame.mixer.music.play()
-                    time.sleep(self.duration)
+                playback = self._play_file(str(self.source))
+
+            else:
+                return None
 
-                    # If you want to use FFMPEG instead, use the following commands:
-                    #cmd = [self.ffmpeg_info.ffplay, '-autoexit', '-nodisp', '-i', self.source]
-                    #subprocess.run(cmd)
+            if blocking:
+                playback.wait()
+            return playback
 
         except SystemError:
             print('If you don''t have FFMPEG available, you can e.g. use installed audio-files. E.g.:')
@@ -407,42 +1333,267 @@ class Sound:
             print('subprocess.run(["C:/Program Files (x86)/VideoLAN/VLC/vlc.exe", "C:/Music/14_Streets_of_Philadelphia.mp3"])')
 
 
-    def generate_sound(self, data, rate):
-        """ Set the properties of a Sound-object. """
+    def _play_file(self, file_name: str) -> 'Playback':
+        """ Start playing a sound-file, without waiting for the end """
 
-        # If the data are not in an integer format (if they are e.g. "float"), convert
-        # them to integer and scale them to a reasonable amplitude
-        if not np.issubdtype(data.dtype, np.integer):
-            defaultAmp = 2**13
-            # Watch out with integer artefacts!
-            data = np.int16(data * (defaultAmp / np.max(data)))
+        if sys.platform=='win32':
+            winsound.PlaySound(file_name, winsound.SND_FILENAME | winsound.SND_ASYNC)
+            return Playback(self.duration,
+                            stop=lambda: winsound.PlaySound(None, 0))
 
-        self.data = data
-        self.rate = rate
-        self.source = None
-        self._setInfo()
+        elif sys.platform == 'darwin':
+            process = subprocess.Popen(['afplay', file_name])
+            return Playback(self.duration, is_busy=lambda: process.poll() is None,
+                            stop=process.terminate)
 
+        else:
+            # "pygame.mixer.music" converts the file to the current mixer settings
+            pygame = _import_pygame()
+            _init_mixer(self.rate, self.numChannels, exact=False)
+            pygame.mixer.music.load(file_name)
+            pygame.mixer.music.play()
+            return Playback(self.duration, is_busy=pygame.mixer.music.get_busy,
+                            stop=pygame.mixer.music.stop)
+
+            # If you want to use FFMPEG instead, use the following commands:
+            #cmd = [self.ffmpeg_info.ffplay, '-autoexit', '-nodisp', '-i', file_name]
+            #process = subprocess.Popen(cmd)
+
+
+    def _play_data(self) -> 'Playback':
+        """ Start playing "self.data" directly from memory, without waiting for the end """
+
+        # "winsound" and "pygame" need int16-data; "ffplay" can handle all
+        # common WAV-formats, so the data are only converted if necessary
+        if sys.platform == 'darwin' and self.data.dtype in (np.uint8, np.int16,
+                                                            np.int32, np.float32):
+            data = np.ascontiguousarray(self.data)
+        else:
+            data = np.ascontiguousarray(_as_int16(self.data))
+        header = _wav_header(self.rate, self.numChannels, data.dtype, len(data))
+
+        if sys.platform=='win32':
+            # "winsound" cannot play from memory asynchronously, so use a thread
+            thread = threading.Thread(target=winsound.PlaySound, daemon=True,
+                    args=(header + data.tobytes(), winsound.SND_MEMORY))
+            thread.start()
+            return Playback(self.duration, is_busy=thread.is_alive,
+                            stop=lambda: winsound.PlaySound(None, 0))
+
+        elif sys.platform == 'darwin':
+            if self.ffmpeg_info.ffplay is None:
+                # "afplay" can only play files
+                return self._play_tmp_file()
+
+            cmd = [str(self.ffmpeg_info.ffplay), '-nodisp', '-autoexit',
+                   '-loglevel', 'error', '-f', 'wav', '-i', '-']
+            process = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+
+            def _feed():
+                # Feed the WAV-data to the stdin-pipe of "ffplay"
+                try:
+                    process.stdin.write(header)
+                    process.stdin.write(memoryview(data).cast('B'))
+                    process.stdin.close()
+                except (BrokenPipeError, OSError):
+                    # "ffplay" has been stopped
+                    pass
+
+            threading.Thread(target=_feed, daemon=True).start()
+            return Playback(self.duration, is_busy=lambda: process.poll() is None,
+                            stop=process.terminate)
 
-    def write_wav(self, out_file:os.PathLike|None = None) -> os.PathLike|None:
-        """
+        else:
+            # The mixer has to match the sound, since the buffer contains raw samples
+            pygame = _import_pygame()
+            _init_mixer(self.rate, self.numChannels)
+            sound = pygame.mixer.Sound(buffer=data)
+            channel = sound.play()
+            return Playback(self.duration, is_busy=channel.get_busy,
+                            stop=channel.stop, resource=sound)
 
-        Write sound data to a WAV-file.
+
+    def _play_tmp_file(self) -> 'Playback':
+        """ Play the data through a temporary WAV-file, which is deleted
+        after the playback """
+
+        tmpFile = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
+        tmpFile.close()
+        self.write_wav(Path(tmpFile.name))
+
+        process = subprocess.Popen(['afplay', tmpFile.name])
+
+        def _clean_up():
+            process.wait()
+            os.remove(tmpFile.name)
+
+        threading.Thread(target=_clean_up, daemon=True).start()
+        return Playback(self.duration, is_busy=lambda: process.poll() is None,
+                        stop=process.terminate)
+
+
+    @classmethod
+    def record(cls, duration: float, rate: float = 44100, numChannels: int = 1,
+               dtype: str|None = None, device=None, stream_factory=None) -> 'Sound':
+        """
+        Record a sound from an input device (e.g. a microphone).
 
         Parameters
         ----------
-        out_file : path of the outfile. If none is given,
-            the user is asked interactively to choose a folder/name
-            for the outfile.
+        duration : length of the recording [sec]
+        rate : sample rate
+        numChannels : number of channels
+        dtype : None for int16-data, or 'float32'
+        device : input device (index or name). Default is the default
+            input device.
+        stream_factory : replaces "sounddevice.InputStream", e.g. with a
+            "LoopbackInput" (see "Recorder")
 
         Returns
         -------
-        out_file : path of the (selected) outfile
+        sound : Sound, with the recorded data
 
+        Notes
+        -----
+        The recording is done with a "Recorder", which requires the package
+        "sounddevice". Input overflows of the device are reported.
 
         Examples
         --------
-        >>> mySound = Sound('test.wav')
-        >>> mySound.write_wav()
+        >>> mySound = Sound.record(3.0)
+        >>> mySound.play()
+
+        """
+
+        if dtype not in _DTYPES:
+            raise ValueError('"dtype" has to be one of {0}!'.format(_DTYPES))
+
+        num_samples = int(round(duration * rate))
+        # The buffer can hold the complete recording, so that a slow
+        # consumer never causes overruns
+        recorder = Recorder(rate, numChannels, dtype or 'int16',
+                            buffer_duration=duration + 0.5, device=device,
+                            stream_factory=stream_factory, max_samples=num_samples)
+        with recorder:
+            data = recorder.read(num_samples)
+
+        return cls(inData=data, inRate=rate, dtype=dtype)
+
+
+    def generate_sound(self, data, rate, fmt: str = 'int16',
+                       normalize: str|None = 'peak', level: float = 0.25,
+                       dither: bool = False):
+        """
+        Set the properties of a Sound-object.
+
+        Parameters
+        ----------
+        data : array
+            sound data. Integer data are used as they are; float data are
+            converted with "convert_float".
+        rate : sample rate
+        fmt : target format of float data ('int16', 'int24', 'int32',
+            'float32'), or None to keep float data as float32, without scaling
+        normalize : 'peak', 'rms', or None; see "convert_float"
+        level : peak- or RMS-level after the normalisation, relative to
+            full scale. The default (0.25) corresponds to an int16 amplitude
+            of 2**13.
+        dither : if True, add TPDF-dither before the quantization
+
+        Examples
+        --------
+        >>> t = np.arange(0, 1, 1/44100)
+        >>> mySound = Sound(inData=np.int16(np.sin(2*np.pi*440*t) * 2**13), inRate=44100)
+        >>> mySound.generate_sound(np.sin(2*np.pi*440*t), 44100, fmt='int24', dither=True)
+
+        """
+
+        # If the data are not in an integer format (if they are e.g. "float"), convert
+        # them to integer and scale them to a reasonable amplitude
+        if fmt is None and not np.issubdtype(data.dtype, np.integer):
+            data = data.astype(np.float32, copy=False)
+        elif not np.issubdtype(data.dtype, np.integer):
+            data = convert_float(data, fmt=fmt, normalize=normalize,
+                                 level=level, dither=dither)
+
+        self.data = data
+        self.rate = rate
+        self.source = None
+        self._source_complete = False
+        self._setInfo()
+
+
+    def resample(self, target_rate: float, quality: str = 'medium'):
+        """
+        Change the sample rate of the sound.
+
+        Parameters
+        ----------
+        target_rate : new sample rate
+        quality : 'low', 'medium', or 'high'; determines the length and the
+            window of the anti-aliasing filter
+
+        Returns
+        -------
+        None :
+            No return value. Sets the properties "data" and "rate".
+
+        Notes
+        -----
+        The resampling is done with polyphase filtering
+        ("scipy.signal.resample_poly"), with the ratio of the sample rates
+        expressed as a fraction up/down. The new rate is "rate*up/down".
+        The data type of the sound is kept. To resample sounds that do not
+        fit into memory, use the class "Resampler" block by block.
+
+        Examples
+        --------
+        >>> mySound = Sound('test.wav')     # e.g. 44100 Hz
+        >>> mySound.resample(16000)
+
+        """
+
+        from scipy.signal import resample_poly
+
+        (up, down) = _resample_ratio(self.rate, target_rate)
+        if up == down:
+            return
+
+        h = _resample_filter(up, down, quality)
+        resampled = resample_poly(self.data, up, down, axis=0, window=h)
+
+        self.data = _cast_like(resampled, self.data.dtype)
+        self.rate = self.rate * up / down
+        if float(self.rate).is_integer():
+            self.rate = int(self.rate)
+        self._source_complete = False
+        self._setInfo()
+
+
+    def write_wav(self, out_file:os.PathLike|None = None) -> os.PathLike|None:
+        """
+
+        Write sound data to a WAV-file.
+
+        Parameters
+        ----------
+        out_file : path of the outfile. If none is given,
+            the user is asked interactively to choose a folder/name
+            for the outfile.
+
+        Returns
+        -------
+        out_file : path of the (selected) outfile
+
+        Notes
+        -----
+        The data are written in their own format: float32-data (see the
+        "dtype" option of "Sound") give an IEEE-float WAV-file.
+
+        Examples
+        --------
+        >>> mySound = Sound('test.wav')
+        >>> mySound.write_wav()
 
         """
 
@@ -454,6 +1605,7 @@ class Sound:
                 print('Output discarded.')
                 return None
 
+        from scipy.io import wavfile
         wavfile.write(str(out_file.absolute()), int(self.rate), self.data)
         print(f'Sounddata written to {out_file.name}, with a sample rate of {str(self.rate)}')
         print(f'OutDir: {out_file.parent}')
@@ -461,6 +1613,110 @@ class Sound:
         return out_file
 
 
+    def write(self, out_file: str|os.PathLike, format: str|None = None,
+              bitrate: str|None = None) -> os.PathLike:
+        """
+
+        Write sound data to a file in any format supported by FFMPEG
+        (MP3, OGG, FLAC, ...).
+
+        Parameters
+        ----------
+        out_file : path of the outfile
+        format : FFMPEG output format (e.g. 'mp3', 'ogg', 'flac'). By
+            default, FFMPEG chooses it from the extension of "out_file".
+        bitrate : audio bitrate for lossy formats, e.g. '192k'
+
+        Returns
+        -------
+        out_file : path of the outfile
+
+        Notes
+        -----
+        The raw sample data are streamed through the stdin-pipe of "ffmpeg",
+        so no temporary file is written. WAV-files (without "format") are
+        written directly with "write_wav".
+        If FFMPEG is not installed, a "sounds.NoFFMPEG_Error" is raised.
+
+        Examples
+        --------
+        >>> mySound = Sound('test.wav')
+        >>> mySound.write('test.mp3', bitrate='192k')
+        >>> mySound.write('test.flac')
+
+        """
+
+        out_file = Path(out_file)
+        if format is None and out_file.suffix.lower() == '.wav':
+            return self.write_wav(out_file)
+
+        if self.ffmpeg_info.ffmpeg == None:
+            print('Sorry, need FFMPEG for non-WAV files!')
+            raise NoFFMPEG_Error
+
+        # The raw formats are little-endian
+        data = self.data.astype(self.data.dtype.newbyteorder('<'), copy=False)
+        if data.dtype.str[1:] not in _RAW_FORMATS:
+            data = _as_int16(data)
+
+        cmd = [str(self.ffmpeg_info.ffmpeg), '-v', 'error', '-y',
+               '-f', _RAW_FORMATS[data.dtype.str[1:]], '-ar', str(int(self.rate)),
+               '-ac', str(self.numChannels), '-i', '-']
+        if format is not None:
+            cmd += ['-f', format]
+        if bitrate is not None:
+            cmd += ['-b:a', str(bitrate)]
+        cmd.append(str(out_file))
+
+        process = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+        try:
+            process.stdin.write(memoryview(np.ascontiguousarray(data)).cast('B'))
+        except BrokenPipeError:
+            # "ffmpeg" has stopped; the error is reported below
+            pass
+        finally:
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+        process.wait()
+
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, cmd)
+
+        print(f'Sounddata written to {out_file.name}, with a sample rate of {str(self.rate)}')
+        print(f'OutDir: {out_file.parent}')
+
+        return out_file
+
+
+    def open_writer(self, out_file: str|os.PathLike) -> 'WavWriter':
+        """
+        Open a WAV-file for incremental writing, with the sample rate, number
+        of channels, and data type of this sound.
+
+        Parameters
+        ----------
+        out_file : path of the outfile
+
+        Returns
+        -------
+        writer : WavWriter
+            Writer object, with the methods "write" and "close"; it can also
+            be used as a context manager.
+
+        Examples
+        --------
+        >>> mySound = Sound('test.wav')
+        >>> with mySound.open_writer('repeated.wav') as writer:
+        >>>     for ii in range(10):
+        >>>         writer.write(mySound.data)
+
+        """
+
+        return WavWriter(out_file, self.rate, self.numChannels, self.dataType)
+
+
     def get_info(self):
         """
         Return information about the sound.
@@ -471,27 +1727,34 @@ class Sound:
 
         Returns
         -------
-        source : name of inFile
-        rate :   sampleRate
-        numChannels : number of channels
-        totalSamples : number of total samples
-        duration : duration [sec]
-        bitsPerSample : bits per sample
+        info : SoundInfo
+            named tuple, with the fields
+            - source : name of inFile
+            - rate :   sampleRate
+            - numChannels : number of channels
+            - totalSamples : number of total samples
+            - duration : duration [sec]
+            - dataType : data type of the samples
+
+        Notes
+        -----
+        To get the same information from a file, without reading the sound
+        data, use "sounds.probe".
 
         Examples
         --------
         >>> mySound = Sound('test.wav')
         >>> info = mySound.get_info()
-        >>> (source, rate, numChannels, totalSamples, duration, bitsPerSample) = mySound.get_info()
+        >>> (source, rate, numChannels, totalSamples, duration, dataType) = mySound.get_info()
 
         """
 
-        return (self.source,
-                self.rate,
-                self.numChannels,
-                self.totalSamples,
-                self.duration,
-                self.dataType)
+        return SoundInfo(self.source,
+                         self.rate,
+                         self.numChannels,
+                         self.totalSamples,
+                         self.duration,
+                         self.dataType)
 
 
     def summary(self):
@@ -522,35 +1785,2859 @@ class Sound:
                 'TotalSamples':totalSamples,
                 'Duration':duration,
                 'DataType':dataType}
+        import yaml
         print(yaml.dump(info, default_flow_style=False))
 
 
-    def _setInfo(self):
-        """ Set the information properties of that sound """
+    def iter_blocks(self, block_size: int, hop: int|None = None) -> Generator:
+        """
+        Iterate over the sound data in blocks of fixed size.
 
-        if len(self.data.shape)==1:
-            self.numChannels = 1
-            self.totalSamples = len(self.data)
-        else:
-            self.numChannels = self.data.shape[1]
-            self.totalSamples = self.data.shape[0]
+        Parameters
+        ----------
+        block_size : number of samples per block
+        hop : number of samples between the start of consecutive blocks.
+            Default is "block_size" (no overlap); smaller values give
+            overlapping blocks.
 
-        self.duration = float(self.totalSamples)/self.rate # [sec]
-        self.dataType = str(self.data.dtype)
+        Returns
+        -------
+        blocks : generator, yielding views of "data". The last block can be
+            shorter than "block_size".
 
-    def _selectInput(self) -> str | os.PathLike:
-        """ GUI for the selection of an in-file. """
+        Notes
+        -----
+        To process a file that does not fit into memory, use
+        "SoundStream(inFile).iter_blocks", which yields the same blocks
+        without loading the whole file.
 
-        my_file = misc.get_file(filter_spec='*.wav',
-                                    dialog_title='Select sound-input:',
-                                    default_name='')
-        if my_file is None:
-            print('No file selected')
-            return ''
-        else:
-            # misc.get_file already shows the selection
-            #print('Selection: ' + full_in_file)
-            return my_file
+        Examples
+        --------
+        >>> mySound = Sound('test.wav')
+        >>> energy = [np.sum(block.astype(float)**2) for block in mySound.iter_blocks(1024, 512)]
+
+        """
+
+        if hop is None:
+            hop = block_size
+        if block_size < 1 or hop < 1:
+            raise ValueError('"block_size" and "hop" have to be positive!')
+
+        for start in range(0, self.totalSamples, hop):
+            yield self.data[start:start+block_size]
+            if start + block_size >= self.totalSamples:
+                return
+
+
+    def stft(self, frame_size: int = 1024, hop: int|None = None,
+             window: str|np.ndarray = 'hann', dtype: str = 'float32') -> tuple:
+        """
+        Short-time Fourier transform of the sound.
+
+        Parameters
+        ----------
+        frame_size : number of samples per frame (the FFT-length)
+        hop : number of samples between the start of consecutive frames.
+            Default is "frame_size/4".
+        window : name of the window (see "scipy.signal.get_window"), or an
+            array with "frame_size" values
+        dtype : 'float32' or 'float64'; precision of the computation
+
+        Returns
+        -------
+        freqs : frequencies of the FFT-bins [Hz]
+        times : centers of the frames [sec]
+        spectra : complex array with the shape (numFrames, numFreqs) for
+            mono, and (numFrames, numFreqs, numChannels) otherwise. Integer
+            data are scaled to the range [-1, 1].
+
+        Notes
+        -----
+        Only complete frames are transformed: frame "i" covers the samples
+        "i*hop" to "i*hop+frame_size". The frames are a strided view of the
+        data, which are transformed together with "scipy.fft.rfft".
+
+        The result is stored with the Sound, so repeated calls with the same
+        parameters do not recompute it. Setting "data" clears the stored
+        results; after modifying single elements of "data", call
+        "clear_cache". For streamed input, use the class "STFT".
+
+        Examples
+        --------
+        >>> mySound = Sound('test.wav')
+        >>> freqs, times, spectra = mySound.stft(frame_size=2048, hop=512)
+
+        """
+
+        hop = hop or max(frame_size // 4, 1)
+        key = ('stft', self.rate, frame_size, hop,
+               window if isinstance(window, str) else np.asarray(window).tobytes(),
+               dtype)
+        if key not in self._analysis_cache:
+            spectra = _stft(self.data, _stft_window(window, frame_size), hop, dtype)
+            freqs = np.fft.rfftfreq(frame_size, 1/self.rate)
+            times = (np.arange(len(spectra))*hop + frame_size/2) / self.rate
+            self._analysis_cache[key] = (freqs, times, spectra)
+
+        return self._analysis_cache[key]
+
+
+    def spectrogram(self, frame_size: int = 1024, hop: int|None = None,
+                    window: str|np.ndarray = 'hann', dB: bool = True) -> tuple:
+        """
+        Power spectrogram of the sound.
+
+        Parameters
+        ----------
+        frame_size, hop, window : see "stft"
+        dB : if True, the power is returned in dB (relative to full scale)
+
+        Returns
+        -------
+        freqs : frequencies of the FFT-bins [Hz]
+        times : centers of the frames [sec]
+        power : float32-array with the shape (numFreqs, numFrames) for mono,
+            and (numFreqs, numFrames, numChannels) otherwise, e.g. for
+            "plt.pcolormesh(times, freqs, power)"
+
+        Examples
+        --------
+        >>> mySound = Sound('test.wav')
+        >>> freqs, times, power = mySound.spectrogram()
+        >>> plt.pcolormesh(times, freqs, power)
+
+        """
+
+        (freqs, times, spectra) = self.stft(frame_size, hop, window)
+
+        power = np.abs(spectra)
+        power **= 2
+        if dB:
+            np.log10(np.maximum(power, np.finfo(power.dtype).tiny), out=power)
+            power *= 10
+        return (freqs, times, np.swapaxes(power, 0, 1))
+
+
+    def process(self, chain: 'ProcessingChain|list') -> 'Sound':
+        """
+        Apply a chain of processing stages to the sound, block by block.
+
+        Parameters
+        ----------
+        chain : ProcessingChain, or a list of stages (see "ProcessingChain")
+
+        Returns
+        -------
+        processed : new Sound, with float32-data in the range [-1, 1]
+
+        Notes
+        -----
+        Only the output array is allocated; the stages work on a buffer of
+        one block. The same chain applied to a "SoundStream" with
+        "ProcessingChain.process_stream" gives the same result.
+
+        Examples
+        --------
+        >>> from sksound.sounds import IIRFilter, Gain, Fade, Limiter
+        >>> mySound = Sound('test.wav')
+        >>> processed = mySound.process([IIRFilter(80), Gain(-3, dB=True),
+        >>>                              Fade(0.1, 0.5), Limiter(0.9)])
+
+        """
+
+        if not isinstance(chain, ProcessingChain):
+            chain = ProcessingChain(chain)
+
+        out = np.empty(self.data.shape, dtype=np.float32)
+        chain.reset(self.rate, self.numChannels, self.totalSamples)
+        for (start, block) in zip(range(0, self.totalSamples, chain.block_size),
+                                  self.iter_blocks(chain.block_size)):
+            out[start:start+len(block)] = chain.process(block)
+
+        return Sound(inData=out, inRate=self.rate, dtype='float32')
+
+
+    def rms(self, frame_size: int = 1024, hop: int|None = None) -> tuple:
+        """
+        RMS-level of the sound, frame by frame.
+
+        Parameters
+        ----------
+        frame_size : number of samples per frame
+        hop : number of samples between the start of consecutive frames.
+            Default is "frame_size" (no overlap).
+
+        Returns
+        -------
+        times : centers of the frames [sec]
+        rms : RMS-values relative to full scale, with the shape (numFrames,)
+            for mono, and (numFrames, numChannels) otherwise
+
+        Notes
+        -----
+        The values are computed from the cumulative sum of the squared
+        samples, chunk by chunk, so integer data are never converted to
+        float as a whole.
+
+        Examples
+        --------
+        >>> mySound = Sound('test.wav')
+        >>> times, rms = mySound.rms(frame_size=2048, hop=512)
+        >>> rms_dB = 20*np.log10(rms)
+
+        """
+
+        hop = hop or frame_size
+        key = ('rms', self.rate, frame_size, hop)
+        if key not in self._analysis_cache:
+            rms = np.sqrt(_frame_power(self.data, frame_size, hop))
+            times = (np.arange(len(rms))*hop + frame_size/2) / self.rate
+            self._analysis_cache[key] = (times, rms)
+
+        return self._analysis_cache[key]
+
+
+    def peak(self, frame_size: int = 1024, hop: int|None = None,
+             true_peak: bool = False) -> tuple:
+        """
+        Peak-level of the sound, frame by frame.
+
+        Parameters
+        ----------
+        frame_size : number of samples per frame
+        hop : number of samples between the start of consecutive frames.
+            Default is "frame_size" (no overlap).
+        true_peak : if True, the peak of the 4x oversampled signal
+            ("true peak", ITU-R BS.1770-4) is determined; otherwise the
+            largest absolute sample value
+
+        Returns
+        -------
+        times : centers of the frames [sec]
+        peak : peak-values relative to full scale, with the shape
+            (numFrames,) for mono, and (numFrames, numChannels) otherwise
+
+        Examples
+        --------
+        >>> mySound = Sound('test.wav')
+        >>> times, peak = mySound.peak(true_peak=True)
+        >>> print(f'True peak: {20*np.log10(peak.max()):.1f} dBTP')
+
+        """
+
+        hop = hop or frame_size
+        key = ('peak', self.rate, frame_size, hop, true_peak)
+        if key not in self._analysis_cache:
+            if true_peak:
+                data = _true_peak_envelope(self.data)
+            else:
+                data = self.data
+            num_frames = max((len(data) - frame_size) // hop + 1, 0)
+
+            if num_frames == 0:
+                peak = np.zeros((0,) + data.shape[1:], dtype=np.float32)
+            else:
+                # Strided view of the frames: (numFrames, [numChannels,] frame_size)
+                frames = np.lib.stride_tricks.sliding_window_view(
+                    data, frame_size, axis=0)[::hop]
+                if true_peak:
+                    peak = frames.max(axis=-1)
+                else:
+                    # The limits are scaled before the sign change, which
+                    # would overflow for the most negative integer
+                    peak = np.maximum(_to_float32(frames.max(axis=-1)),
+                                      -_to_float32(frames.min(axis=-1)))
+
+            times = (np.arange(num_frames)*hop + frame_size/2) / self.rate
+            self._analysis_cache[key] = (times, peak)
+
+        return self._analysis_cache[key]
+
+
+    def loudness(self) -> 'Loudness':
+        """
+        Loudness of the sound, according to ITU-R BS.1770-4 / EBU R 128.
+
+        Returns
+        -------
+        loudness : Loudness
+            named tuple, with the fields
+            - integrated : gated loudness of the whole sound [LUFS]
+            - shortTerm : loudness of 3 s windows, every 100 ms [LUFS]
+            - momentary : loudness of 400 ms windows, every 100 ms [LUFS]
+
+        Notes
+        -----
+        The data are processed block by block with a "LoudnessMeter", which
+        can also be used for streamed input.
+
+        Examples
+        --------
+        >>> mySound = Sound('test.wav')
+        >>> print(f'{mySound.loudness().integrated:.1f} LUFS')
+
+        """
+
+        key = ('loudness', self.rate)
+        if key not in self._analysis_cache:
+            meter = LoudnessMeter(self.rate, self.numChannels)
+            for block in self.iter_blocks(2**16):
+                meter.process(block)
+            self._analysis_cache[key] = Loudness(meter.integrated, meter.shortTerm,
+                                                 meter.momentary)
+
+        return self._analysis_cache[key]
+
+
+    def clear_cache(self):
+        """ Discard the stored results of the analysis methods (e.g. "stft", "rms") """
+        self._analysis_cache = {}
+
+
+    @property
+    def data(self) -> np.ndarray:
+        return self._data
+
+
+    @data.setter
+    def data(self, data: np.ndarray):
+        # Stored analysis results are only valid for the previous data
+        self._data = data
+        self._analysis_cache = {}
+
+
+    def _setInfo(self):
+        """ Set the information properties of that sound """
+
+        if len(self.data.shape)==1:
+            self.numChannels = 1
+            self.totalSamples = len(self.data)
+        else:
+            self.numChannels = self.data.shape[1]
+            self.totalSamples = self.data.shape[0]
+
+        self.duration = float(self.totalSamples)/self.rate # [sec]
+        self.dataType = str(self.data.dtype)
+
+    def _selectInput(self) -> str | os.PathLike:
+        """ GUI for the selection of an in-file. """
+
+        my_file = misc.get_file(filter_spec='*.wav',
+                                    dialog_title='Select sound-input:',
+                                    default_name='')
+        if my_file is None:
+            print('No file selected')
+            return ''
+        else:
+            # misc.get_file already shows the selection
+            #print('Selection: ' + full_in_file)
+            return my_file
+
+
+class SoundStream:
+    """
+
+    Block-wise reading of sound-files that are too large for the memory.
+
+    Only the header of the file is read on initialization. The samples are
+    read with "iter_blocks", from a buffered file for WAV-files, and from an
+    FFMPEG-pipe for other formats. The peak memory is proportional to the
+    block size, not to the file size.
+
+    Parameters
+    ----------
+    inFile : string or pathlib-path
+        path- and file-name of infile
+
+    Notes
+    -----
+    SoundStreamProperties:
+        - source
+        - rate
+        - numChannels
+        - totalSamples (estimated from the duration, for non WAV-files)
+        - duration
+        - dataType
+
+    Examples
+    --------
+    >>> from sksound.sounds import SoundStream
+    >>> stream = SoundStream('recording.wav')
+    >>> for block in stream.iter_blocks(block_size=4096, hop=2048):
+    >>>     print(np.max(np.abs(block)))
+
+    """
+
+    def __init__(self, inFile: str|os.PathLike):
+        """ Read the header information of the sound-file """
+
+        if not os.path.exists(inFile):
+            print('{0} does not exist!'.format(inFile))
+            raise FileNotFoundError
+
+        self.source = str(inFile)
+        self.ffmpeg_info = None
+
+        if os.path.splitext(self.source)[1].lower() == '.wav':
+            with open(self.source, 'rb') as in_file:
+                header = _read_wav_header(in_file)
+            self.rate = header['rate']
+            self.numChannels = header['numChannels']
+            self.totalSamples = header['totalSamples']
+            self.dataType = header['dataType']
+            self._sampleWidth = header['sampleWidth']
+            self._dataOffset = header['dataOffset']
+            self.duration = float(self.totalSamples)/self.rate # [sec]
+
+        else:
+            self.ffmpeg_info = FFMPEG_info.cached()
+            if self.ffmpeg_info.ffmpeg == None:
+                print('Sorry, need FFMPEG for non-WAV files!')
+                raise NoFFMPEG_Error
+
+            stream_info = _ffprobe(self.ffmpeg_info.ffprobe, self.source)
+            self.rate = stream_info['rate']
+            self.numChannels = stream_info['numChannels']
+            self.duration = stream_info['duration']
+            if self.duration is None:
+                self.totalSamples = None
+            else:
+                self.totalSamples = int(round(self.duration * self.rate))
+            self.dataType = 'int16'
+            self._sampleWidth = 2
+            self._dataOffset = None
+
+
+    def iter_blocks(self, block_size: int, hop: int|None = None) -> Generator:
+        """
+        Iterate over the sound-file in blocks of fixed size.
+
+        Parameters
+        ----------
+        block_size : number of samples per block
+        hop : number of samples between the start of consecutive blocks.
+            Default is "block_size" (no overlap); smaller values give
+            overlapping blocks.
+
+        Returns
+        -------
+        blocks : generator, yielding arrays with the shape (block_size,) for
+            mono, and (block_size, numChannels) otherwise. The last block can
+            be shorter than "block_size".
+
+        Examples
+        --------
+        >>> stream = SoundStream('long_recording.mp3')
+        >>> for block in stream.iter_blocks(16000):
+        >>>     features.append(np.std(block))
+
+        """
+
+        if hop is None:
+            hop = block_size
+        if block_size < 1 or hop < 1:
+            raise ValueError('"block_size" and "hop" have to be positive!')
+
+        frame_shape = () if self.numChannels == 1 else (self.numChannels,)
+        dtype = np.dtype(self.dataType)
+
+        if self._dataOffset is not None:
+            with open(self.source, 'rb') as in_file:
+                in_file.seek(self._dataOffset)
+                yield from _iter_stream(in_file, frame_shape, dtype,
+                                        self._sampleWidth, block_size, hop,
+                                        self.totalSamples)
+
+        else:
+            cmd = [str(self.ffmpeg_info.ffmpeg), '-v', 'error', '-i', self.source,
+                   '-f', 's16le', '-acodec', 'pcm_s16le',
+                   '-ac', str(self.numChannels), '-']
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+            try:
+                yield from _iter_stream(process.stdout, frame_shape, dtype,
+                                        self._sampleWidth, block_size, hop)
+            finally:
+                # Also stop "ffmpeg" if the iteration is stopped early
+                process.stdout.close()
+                if process.poll() is None:
+                    process.kill()
+                process.wait()
+
+
+class WavWriter:
+    """
+
+    Incremental writing of WAV-files, e.g. for long recordings.
+
+    The sound data are written block by block with "write", so only the
+    current block has to be in memory. "close" sets the sizes in the header.
+    Files that exceed 4 GB are turned into RF64-files.
+
+    Parameters
+    ----------
+    out_file : string or pathlib-path
+        path- and file-name of the outfile
+    rate : sample rate
+    numChannels : number of channels
+    dtype : data type of the samples ('uint8', 'int16', 'int32', 'float32',
+        'float64')
+
+    Notes
+    -----
+    WavWriterProperties:
+        - out_file
+        - rate
+        - numChannels
+        - dataType
+        - totalSamples (samples written so far)
+
+    WavWriterMethods:
+        - write
+        - close
+
+    Examples
+    --------
+    >>> from sksound.sounds import WavWriter
+    >>> with WavWriter('recording.wav', rate=44100, numChannels=2) as writer:
+    >>>     for block in blocks:
+    >>>         writer.write(block)
+
+    """
+
+    def __init__(self, out_file: str|os.PathLike, rate: float, numChannels: int,
+                 dtype: str = 'int16'):
+        """ Open the outfile, and write a preliminary header """
+
+        self.out_file = Path(out_file)
+        self.rate = rate
+        self.numChannels = numChannels
+        self.dataType = str(np.dtype(dtype))
+        self.totalSamples = 0
+
+        if self.dataType not in ('uint8', 'int16', 'int32', 'float32', 'float64'):
+            raise ValueError('WAV-files cannot contain {0}-data!'.format(self.dataType))
+
+        # Space for a "ds64" chunk is reserved, in case the file becomes too
+        # large for a RIFF-header
+        self._header = _wav_header(rate, numChannels, self.dataType, 0,
+                                   reserve_ds64=True)
+        self._file = open(self.out_file, 'wb')
+        self._file.write(self._header)
+
+
+    def write(self, block: np.ndarray):
+        """
+        Append a block of sound data.
+
+        Parameters
+        ----------
+        block : array with the shape (numSamples,) for mono, and
+            (numSamples, numChannels) otherwise. Its type has to be of the
+            same kind (integer or float) as "dataType". Integer data must
+            fit into "dataType" without loss (e.g. no int32-blocks in an
+            int16-file), since they would wrap around.
+        """
+
+        if self._file is None:
+            raise ValueError('The WavWriter is already closed!')
+
+        block = np.asarray(block)
+        if block.ndim == 1:
+            num_channels = 1
+        else:
+            num_channels = block.shape[1]
+        if num_channels != self.numChannels:
+            raise ValueError('Expected {0} channels, got {1}!'.format(
+                self.numChannels, num_channels))
+
+        dtype = np.dtype(self.dataType)
+        if block.dtype != dtype:
+            if np.issubdtype(block.dtype, np.floating) != np.issubdtype(dtype, np.floating):
+                raise TypeError('Cannot write {0}-data to a {1}-file!'.format(
+                    block.dtype, self.dataType))
+            if np.issubdtype(dtype, np.integer) and not np.can_cast(block.dtype, dtype, 'safe'):
+                raise TypeError('{0}-data do not fit into a {1}-file!'.format(
+                    block.dtype, self.dataType))
+            block = block.astype(dtype)
+
+        self._file.write(memoryview(np.ascontiguousarray(block)).cast('B'))
+        self.totalSamples += len(block)
+
+
+    def close(self):
+        """ Write the final sizes to the header, and close the file """
+
+        if self._file is None:
+            return
+
+        block_align = self.numChannels * np.dtype(self.dataType).itemsize
+        data_size = self.totalSamples * block_align
+
+        # Chunks are word-aligned
+        if data_size % 2:
+            self._file.write(b'\0')
+        riff_size = self._file.tell() - 8
+
+        fact_pos = self._header.find(b'fact')
+        data_size_pos = len(self._header) - 4
+
+        if riff_size <= 0xFFFFFFFF:
+            self._file.seek(4)
+            self._file.write(struct.pack('<I', riff_size))
+            self._file.seek(data_size_pos)
+            self._file.write(struct.pack('<I', data_size))
+        else:
+            # RF64: the 32-bit sizes are set to -1, and the real ones are in "ds64"
+            self._file.seek(0)
+            self._file.write(b'RF64' + struct.pack('<I', 0xFFFFFFFF))
+            self._file.seek(12)
+            self._file.write(b'ds64' + struct.pack('<IQQQI', 28, riff_size,
+                             data_size, self.totalSamples, 0))
+            self._file.seek(data_size_pos)
+            self._file.write(struct.pack('<I', 0xFFFFFFFF))
+
+        if fact_pos >= 0:
+            self._file.seek(fact_pos + 8)
+            self._file.write(struct.pack('<I', min(self.totalSamples, 0xFFFFFFFF)))
+
+        self._file.close()
+        self._file = None
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class Resampler:
+    """
+
+    Block-wise polyphase resampling, for sounds that do not fit into memory.
+
+    The filter state is kept from one block to the next, so the
+    concatenated output is (within floating point precision) the same as
+    the result of "Sound.resample" on the complete signal.
+
+    Parameters
+    ----------
+    rate : sample rate of the input
+    target_rate : sample rate of the output
+    quality : 'low', 'medium', or 'high'
+
+    Notes
+    -----
+    ResamplerProperties:
+        - rate
+        - target_rate (exact rate of the output, rate*up/down)
+
+    ResamplerMethods:
+        - process
+        - flush
+
+    Examples
+    --------
+    >>> from sksound.sounds import SoundStream, Resampler
+    >>> stream = SoundStream('long_recording.wav')
+    >>> resampler = Resampler(stream.rate, 16000)
+    >>> with WavWriter('long_16k.wav', 16000, stream.numChannels, 'float32') as writer:
+    >>>     for block in stream.iter_blocks(2**16):
+    >>>         writer.write(resampler.process(block/2**15))
+    >>>     writer.write(resampler.flush())
+
+    """
+
+    def __init__(self, rate: float, target_rate: float, quality: str = 'medium'):
+        """ Design the filter, and initialize the filter state """
+
+        (self._up, self._down) = _resample_ratio(rate, target_rate)
+        self.rate = rate
+        self.target_rate = rate * self._up / self._down
+
+        # Shape and type of the output, from the first block
+        self._frame_shape = ()
+        self._dtype = np.float64
+
+        # The same rate needs no filter
+        self._history = None
+        if self._up == self._down:
+            return
+
+        (up, down) = (self._up, self._down)
+        h = _resample_filter(up, down, quality) * up
+        half_len = (len(h) - 1) // 2
+
+        # Same alignment as in "scipy.signal.resample_poly"
+        n_pre_pad = down - half_len % down
+        self._pre_remove = (half_len + n_pre_pad) // down
+        h = np.concatenate((np.zeros(n_pre_pad), h))
+
+        # Polyphase decomposition: row "p" holds the taps of phase "p", in
+        # the order in which they are applied to the latest input samples
+        self._num_taps = int(np.ceil(len(h) / up))
+        h = np.concatenate((h, np.zeros(self._num_taps*up - len(h))))
+        self._phases = h.reshape(self._num_taps, up).T.copy()
+
+        # Input history, starting at the input sample "self._base". Zeros
+        # before the start of the signal
+        self._history = None
+        self._base = -self._num_taps
+        self._num_in = 0
+        self._num_out = 0
+
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """
+        Resample the next block of the input.
+
+        Parameters
+        ----------
+        block : array with the shape (numSamples,) or (numSamples, numChannels)
+
+        Returns
+        -------
+        resampled : float array with the output samples that can be computed
+            from the input so far. Because of the filter delay, the output
+            lags behind the input; the rest is returned by "flush".
+        """
+
+        block = np.asarray(block)
+        self._frame_shape = block.shape[1:]
+        self._dtype = _float_type(block.dtype)
+        if self._up == self._down:
+            return block.astype(self._dtype)
+
+        if self._history is None:
+            self._history = np.zeros((self._num_taps,) + block.shape[1:],
+                                     dtype=_float_type(block.dtype))
+        self._history = np.concatenate((self._history, block))
+        self._num_in += len(block)
+
+        # Outputs for which all required input samples are available
+        last = (self._num_in*self._up - 1) // self._down - self._pre_remove
+        return self._compute(last + 1)
+
+
+    def flush(self) -> np.ndarray:
+        """ Return the remaining output samples, at the end of the input """
+
+        if self._history is None or self._up == self._down:
+            return np.zeros((0,) + self._frame_shape, dtype=self._dtype)
+
+        total_out = -(-self._num_in * self._up // self._down)
+
+        # Zeros after the end of the signal
+        last_index = ((total_out - 1 + self._pre_remove) * self._down) // self._up
+        num_zeros = max(last_index + 1 - (self._base + len(self._history)), 0)
+        self._history = np.concatenate((self._history,
+                np.zeros((num_zeros,) + self._history.shape[1:], self._history.dtype)))
+
+        return self._compute(total_out)
+
+
+    def _compute(self, stop: int) -> np.ndarray:
+        """ Compute the output samples "self._num_out" to "stop" (exclusive) """
+
+        outputs = np.arange(self._num_out, max(stop, self._num_out))
+        positions = (outputs + self._pre_remove) * self._down
+        latest = positions // self._up - self._base
+        phases = positions % self._up
+
+        # Input samples for each output: (numOutputs, numTaps[, numChannels])
+        window = self._history[latest[:, np.newaxis] - np.arange(self._num_taps)]
+        resampled = np.einsum('nk,nk...->n...', self._phases[phases], window)
+        resampled = resampled.astype(self._history.dtype, copy=False)
+
+        # Drop the input samples that are not needed any more
+        self._num_out = max(stop, self._num_out)
+        next_latest = ((self._num_out + self._pre_remove) * self._down) // self._up
+        first_needed = next_latest - self._num_taps + 1
+        if first_needed > self._base:
+            self._history = self._history[first_needed - self._base:]
+            self._base = first_needed
+
+        return resampled
+
+
+class STFT:
+    """
+
+    Block-wise short-time Fourier transform, for sounds that do not fit
+    into memory.
+
+    The samples of an incomplete frame are kept until the next block, so the
+    frames returned by "process" are the same as those of "Sound.stft" on
+    the complete signal.
+
+    Parameters
+    ----------
+    rate : sample rate
+    frame_size : number of samples per frame (the FFT-length)
+    hop : number of samples between the start of consecutive frames.
+        Default is "frame_size/4".
+    window : name of the window (see "scipy.signal.get_window"), or an
+        array with "frame_size" values
+    dtype : 'float32' or 'float64'; precision of the computation
+
+    Notes
+    -----
+    STFTProperties:
+        - rate
+        - frame_size
+        - hop
+        - freqs (frequencies of the FFT-bins [Hz])
+        - numFrames (number of frames returned so far)
+
+    STFTMethods:
+        - process
+
+    Examples
+    --------
+    >>> from sksound.sounds import SoundStream, STFT
+    >>> stream = SoundStream('long_recording.wav')
+    >>> stft = STFT(stream.rate, frame_size=2048)
+    >>> for block in stream.iter_blocks(2**16):
+    >>>     spectra = stft.process(block)       # (numFrames, numFreqs[, numChannels])
+
+    """
+
+    def __init__(self, rate: float, frame_size: int = 1024, hop: int|None = None,
+                 window: str|np.ndarray = 'hann', dtype: str = 'float32'):
+        """ Compute the window, and the frequencies of the bins """
+
+        self.rate = rate
+        self.frame_size = frame_size
+        self.hop = hop or max(frame_size // 4, 1)
+        self.freqs = np.fft.rfftfreq(frame_size, 1/rate)
+        self.numFrames = 0
+
+        self._window = _stft_window(window, frame_size)
+        self._dtype = dtype
+        self._pending = None
+
+        # Input samples before the start of the next frame, which have not
+        # arrived yet (only for "hop > frame_size")
+        self._skip = 0
+
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """
+        Transform the next block of the input.
+
+        Parameters
+        ----------
+        block : array with the shape (numSamples,) or (numSamples, numChannels)
+
+        Returns
+        -------
+        spectra : complex array with the shape (numFrames, numFreqs) for mono,
+            and (numFrames, numFreqs, numChannels) otherwise, for all frames
+            that are complete so far. Frame "i" starts at the input sample
+            "i*hop".
+        """
+
+        block = np.asarray(block)
+        num_skipped = min(self._skip, len(block))
+        block = block[num_skipped:]
+        self._skip -= num_skipped
+
+        if self._pending is None:
+            self._pending = block
+        else:
+            self._pending = np.concatenate((self._pending, block))
+
+        spectra = _stft(self._pending, self._window, self.hop, self._dtype)
+        next_start = len(spectra) * self.hop
+        self._skip += max(next_start - len(self._pending), 0)
+        self._pending = self._pending[next_start:]
+        self.numFrames += len(spectra)
+        return spectra
+
+
+class LoudnessMeter:
+    """
+
+    Loudness measurement according to ITU-R BS.1770-4 / EBU R 128, block
+    by block.
+
+    The state of the K-weighting filter and the energies of the 100 ms
+    steps are kept from one block to the next, so the gating for the
+    integrated loudness covers everything processed so far.
+
+    Parameters
+    ----------
+    rate : sample rate
+    numChannels : number of channels. For 5.1-sound (6 channels, in the
+        order L, R, C, LFE, Ls, Rs), the LFE-channel is ignored and the
+        surround channels are weighted with 1.41.
+
+    Notes
+    -----
+    All loudness values are in LUFS. Momentary loudness is computed over
+    400 ms, short-term loudness over 3 s, both every 100 ms.
+
+    LoudnessMeterProperties:
+        - rate
+        - numChannels
+        - integrated
+        - momentary
+        - shortTerm
+
+    LoudnessMeterMethods:
+        - process
+
+    Examples
+    --------
+    >>> from sksound.sounds import SoundStream, LoudnessMeter
+    >>> stream = SoundStream('long_recording.wav')
+    >>> meter = LoudnessMeter(stream.rate, stream.numChannels)
+    >>> for block in stream.iter_blocks(2**16):
+    >>>     meter.process(block)
+    >>> print(f'{meter.integrated:.1f} LUFS')
+
+    """
+
+    def __init__(self, rate: float, numChannels: int = 1):
+        """ Design the K-weighting filter, and reset the measurement """
+
+        self.rate = rate
+        self.numChannels = numChannels
+
+        self._sos = _k_weighting(rate)
+        self._zi = np.zeros((len(self._sos), 2, numChannels))
+        if numChannels == 6:
+            self._weights = np.array([1., 1., 1., 0., 1.41, 1.41])
+        else:
+            self._weights = np.ones(numChannels)
+
+        # Weighted sums of the squared, K-weighted samples: one per
+        # complete 100 ms step, plus the one of the current step
+        self._step_size = int(round(0.1 * rate))
+        self._steps = []
+        self._partial_sum = 0.
+        self._partial_count = 0
+
+
+    def process(self, block: np.ndarray):
+        """
+        Add the next block of sound data to the measurement.
+
+        Parameters
+        ----------
+        block : array with the shape (numSamples,) or (numSamples, numChannels)
+        """
+
+        from scipy.signal import sosfilt
+
+        block = _to_float32(np.asarray(block)).reshape((len(block), -1))
+        (filtered, self._zi) = sosfilt(self._sos, block.astype(np.float64),
+                                       axis=0, zi=self._zi)
+        energy = np.einsum('ij,ij,j->i', filtered, filtered, self._weights)
+
+        # Complete the current step
+        step_size = self._step_size
+        num_used = min(step_size - self._partial_count, len(energy))
+        self._partial_sum += energy[:num_used].sum()
+        self._partial_count += num_used
+        if self._partial_count < step_size:
+            return
+        self._steps.append(np.array([self._partial_sum]))
+
+        # Complete steps of this block, and the start of the next one
+        num_steps = (len(energy) - num_used) // step_size
+        end = num_used + num_steps*step_size
+        self._steps.append(energy[num_used:end].reshape(num_steps, step_size).sum(axis=1))
+        self._partial_sum = energy[end:].sum()
+        self._partial_count = len(energy) - end
+
+
+    def _block_energies(self, num_steps: int) -> np.ndarray:
+        """ Mean weighted energy of all (overlapping) blocks of "num_steps" steps """
+
+        if len(self._steps) > 1:
+            self._steps = [np.concatenate(self._steps)]
+        steps = self._steps[0] if self._steps else np.zeros(0)
+        if len(steps) < num_steps:
+            return np.zeros(0)
+
+        cumulative = np.concatenate(([0.], np.cumsum(steps)))
+        sums = cumulative[num_steps:] - cumulative[:-num_steps]
+        return np.maximum(sums, 0) / (num_steps * self._step_size)
+
+
+    @property
+    def momentary(self) -> np.ndarray:
+        """ Loudness of the 400 ms blocks, every 100 ms [LUFS] """
+        return _lufs(self._block_energies(4))
+
+
+    @property
+    def shortTerm(self) -> np.ndarray:
+        """ Loudness of the 3 s blocks, every 100 ms [LUFS] """
+        return _lufs(self._block_energies(30))
+
+
+    @property
+    def integrated(self) -> float:
+        """ Gated loudness of everything processed so far [LUFS] """
+
+        energies = self._block_energies(4)
+
+        # Absolute gate at -70 LUFS, then relative gate 10 LU below the
+        # loudness of the remaining blocks
+        energies = energies[_lufs(energies) > -70]
+        if len(energies) == 0:
+            return -np.inf
+        relative_gate = _lufs(np.mean(energies)) - 10
+        energies = energies[_lufs(energies) > relative_gate]
+        return float(_lufs(np.mean(energies)))
+
+
+class Stage:
+    """
+
+    Base class of the stages of a "ProcessingChain".
+
+    A stage processes float32 blocks with the shape (numSamples,
+    numChannels), in place where possible. Everything that has to be
+    carried from one block to the next (filter states, positions) is kept
+    in the stage, so the result does not depend on the block size.
+
+    Derived classes implement "process", and "reset" if they need the sample
+    rate, the number of channels, or the total length of the sound.
+    """
+
+    def reset(self, rate: float, numChannels: int, totalSamples: int|None = None):
+        """ Prepare the stage for a new sound """
+        pass
+
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """ Process the next block, and return the result """
+        raise NotImplementedError
+
+
+class Gain(Stage):
+    """
+
+    Multiply the sound by a constant gain.
+
+    Parameters
+    ----------
+    gain : linear gain factor
+    dB : if True, "gain" is given in dB
+
+    """
+
+    def __init__(self, gain: float, dB: bool = False):
+        self.gain = 10**(gain/20) if dB else gain
+
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        block *= self.gain
+        return block
+
+
+class IIRFilter(Stage):
+    """
+
+    IIR-filter, applied with "scipy.signal.sosfilt". The filter state is
+    carried from one block to the next.
+
+    Parameters
+    ----------
+    cutoff : cutoff frequency [Hz], or (low, high) for 'bandpass' and
+        'bandstop'
+    btype : 'highpass', 'lowpass', 'bandpass', or 'bandstop'
+    order : order of the Butterworth filter
+    sos : second-order sections of a filter designed for the sample rate of
+        the sound; replaces the Butterworth filter
+
+    Examples
+    --------
+    >>> highpass = IIRFilter(80, 'highpass', order=4)
+
+    """
+
+    def __init__(self, cutoff: float|tuple|None = None, btype: str = 'highpass',
+                 order: int = 2, sos: np.ndarray|None = None):
+        if cutoff is None and sos is None:
+            raise ValueError('Either "cutoff" or "sos" is required!')
+
+        self.cutoff = cutoff
+        self.btype = btype
+        self.order = order
+        self.sos = None if sos is None else np.asarray(sos)
+        self._zi = None
+
+
+    def reset(self, rate: float, numChannels: int, totalSamples: int|None = None):
+        """ Design the filter for "rate", and clear its state """
+
+        if self.cutoff is not None:
+            from scipy.signal import butter
+            self.sos = butter(self.order, self.cutoff, self.btype, fs=rate, output='sos')
+        self._zi = np.zeros((len(self.sos), 2, numChannels))
+
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        from scipy.signal import sosfilt
+
+        if len(block) == 0:
+            return block
+
+        (block[:], self._zi) = sosfilt(self.sos, block, axis=0, zi=self._zi)
+        return block
+
+
+class Fade(Stage):
+    """
+
+    Linear fade-in at the start, and fade-out at the end of the sound.
+
+    Parameters
+    ----------
+    fade_in : duration of the fade-in [sec]
+    fade_out : duration of the fade-out [sec]. Requires the total length of
+        the sound, which is only estimated for streamed non-WAV files.
+
+    """
+
+    def __init__(self, fade_in: float = 0., fade_out: float = 0.):
+        self.fade_in = fade_in
+        self.fade_out = fade_out
+
+
+    def reset(self, rate: float, numChannels: int, totalSamples: int|None = None):
+        """ Convert the durations to samples, and start at the beginning """
+
+        if self.fade_out and totalSamples is None:
+            raise ValueError('A fade-out requires the length of the sound!')
+
+        self._in_samples = int(round(self.fade_in * rate))
+        self._out_samples = int(round(self.fade_out * rate))
+        self._total = totalSamples
+        self._position = 0
+
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        if len(block) == 0:
+            return block
+
+        positions = np.arange(self._position, self._position + len(block))
+        self._position += len(block)
+
+        # Only the parts of the block that overlap with a fade are changed
+        if self._in_samples and positions[0] < self._in_samples:
+            num = min(self._in_samples - positions[0], len(block))
+            block[:num] *= (positions[:num, np.newaxis] / self._in_samples).astype(np.float32)
+        if self._out_samples:
+            first_out = self._total - self._out_samples
+            if positions[-1] >= first_out:
+                start = max(first_out - positions[0], 0)
+                remaining = (self._total - positions[start:]) / self._out_samples
+                block[start:] *= np.clip(remaining, 0, 1)[:, np.newaxis].astype(np.float32)
+        return block
+
+
+class Limiter(Stage):
+    """
+
+    Peak limiter: the gain is reduced instantly where the signal would
+    exceed "threshold", and recovers at a constant rate afterwards.
+
+    Parameters
+    ----------
+    threshold : maximum absolute value of the output, relative to full scale
+    release : recovery rate of the gain [dB/sec]
+
+    Notes
+    -----
+    The gain is the same for all channels. It is computed without a loop
+    over the samples: with a constant release rate "r", the gain in dB at
+    sample "n" is the minimum over all previous samples "k" of
+    "required_gain[k] + r*(n-k)", which is a cumulative minimum.
+
+    """
+
+    def __init__(self, threshold: float = 0.98, release: float = 40.):
+        self.threshold = threshold
+        self.release = release
+
+
+    def reset(self, rate: float, numChannels: int, totalSamples: int|None = None):
+        """ Start without gain reduction """
+
+        self._release_per_sample = self.release / rate
+        self._gain_dB = 0.
+
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        if len(block) == 0:
+            return block
+
+        peak = np.abs(block).max(axis=1)
+        with np.errstate(divide='ignore'):
+            required = np.minimum(20*np.log10(self.threshold / peak), 0)
+
+        ramp = self._release_per_sample * np.arange(len(block))
+        gain_dB = np.minimum.accumulate(required - ramp) + ramp
+        gain_dB = np.minimum(gain_dB, self._gain_dB + ramp + self._release_per_sample)
+        gain_dB = np.minimum(gain_dB, 0)
+        self._gain_dB = gain_dB[-1]
+
+        block *= (10**(gain_dB/20)).astype(np.float32)[:, np.newaxis]
+        return block
+
+
+class ProcessingChain:
+    """
+
+    Chain of processing stages (e.g. "IIRFilter", "Gain", "Fade",
+    "Limiter"), which are applied block by block.
+
+    The same chain can be applied to a Sound in memory ("Sound.process"),
+    or to a sound-file that is read block by block ("process_stream"). The
+    results are the same, within float precision.
+
+    Parameters
+    ----------
+    stages : list of stages, which are applied in the given order
+    block_size : number of samples per block
+
+    Notes
+    -----
+    The data are processed as float32, in the range [-1, 1] (integer data
+    are scaled accordingly). Each block is converted into a pre-allocated
+    buffer, which the stages modify in place.
+
+    ProcessingChainProperties:
+        - stages
+        - block_size
+
+    ProcessingChainMethods:
+        - reset
+        - process
+        - process_stream
+
+    Examples
+    --------
+    >>> from sksound.sounds import (Sound, SoundStream, WavWriter, ProcessingChain,
+    >>>                             IIRFilter, Gain, Fade, Limiter)
+    >>> chain = ProcessingChain([IIRFilter(80, 'highpass'), Gain(6, dB=True),
+    >>>                          Fade(0.5, 0.5), Limiter(0.9)])
+    >>> processed = Sound('test.wav').process(chain)
+    >>>
+    >>> stream = SoundStream('long_recording.wav')
+    >>> with WavWriter('processed.wav', stream.rate, stream.numChannels, 'float32') as writer:
+    >>>     for block in chain.process_stream(stream):
+    >>>         writer.write(block)
+
+    """
+
+    def __init__(self, stages: list, block_size: int = 2**16):
+        self.stages = list(stages)
+        self.block_size = block_size
+        self._buffer = None
+
+
+    def reset(self, rate: float, numChannels: int, totalSamples: int|None = None):
+        """ Prepare all stages for a new sound, and allocate the buffer """
+
+        for stage in self.stages:
+            stage.reset(rate, numChannels, totalSamples)
+        self._buffer = np.empty((self.block_size, numChannels), dtype=np.float32)
+
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """
+        Process the next block, after "reset".
+
+        Parameters
+        ----------
+        block : array with the shape (numSamples,) or (numSamples, numChannels),
+            with at most "block_size" samples
+
+        Returns
+        -------
+        processed : float32-array with the shape of "block". It is a view of
+            the internal buffer, which is overwritten by the next call.
+        """
+
+        if len(block) > self.block_size:
+            raise ValueError('The block has more than {0} samples!'.format(self.block_size))
+
+        buffer = self._buffer[:len(block)]
+        _to_float32_into(block.reshape(buffer.shape), buffer)
+        for stage in self.stages:
+            buffer = stage.process(buffer)
+        return buffer.reshape(block.shape)
+
+
+    def process_stream(self, stream: 'SoundStream') -> Generator:
+        """
+        Process a sound-file block by block.
+
+        Parameters
+        ----------
+        stream : SoundStream
+
+        Returns
+        -------
+        blocks : generator, yielding the processed blocks (views of the
+            internal buffer, which are only valid until the next block)
+        """
+
+        self.reset(stream.rate, stream.numChannels, stream.totalSamples)
+        for block in stream.iter_blocks(self.block_size):
+            yield self.process(block)
+
+
+class _MixerTrack:
+    """ Sequential reader for one entry of a "Mixer": float32-samples at the
+    output rate, with the gain and pan applied """
+
+    def __init__(self, source: 'Sound|SoundStream', start_time: float, gain: float,
+                 pan: float, rate: float, num_channels: int):
+
+        self.start = int(round(start_time * rate))
+        self._source = source
+        self._matrix = _mix_matrix(source.numChannels, num_channels, gain, pan)
+
+        (up, down) = _resample_ratio(source.rate, rate)
+        self.length = -(-source.totalSamples * up // down)
+        if up == down:
+            self._resampler = None
+        else:
+            self._resampler = Resampler(source.rate, rate)
+
+        self._blocks = None
+        self._pending = []
+        self._available = 0
+
+
+    def read(self, num_samples: int) -> np.ndarray:
+        """ The next "num_samples" samples, (num_samples, numChannels) of the output """
+
+        if self._blocks is None:
+            self._blocks = self._source.iter_blocks(2**14)
+
+        while self._available < num_samples and self._blocks is not False:
+            try:
+                block = _to_float32(next(self._blocks))
+                if self._resampler is not None:
+                    block = self._resampler.process(block)
+            except StopIteration:
+                block = np.zeros(0, dtype=np.float32)
+                if self._resampler is not None:
+                    block = self._resampler.flush()
+                self._blocks = False
+            self._pending.append(block.reshape((len(block), self._matrix.shape[0])))
+            self._available += len(block)
+
+        pending = np.concatenate(self._pending) if self._pending else \
+                  np.zeros((0, self._matrix.shape[0]), dtype=np.float32)
+        samples = pending[:num_samples]
+        self._pending = [pending[num_samples:]]
+        self._available = len(self._pending[0])
+
+        # Sources that are shorter than expected (e.g. estimated lengths of
+        # non-WAV files) are padded with zeros
+        if len(samples) < num_samples:
+            samples = np.concatenate((samples, np.zeros(
+                (num_samples - len(samples), samples.shape[1]), dtype=samples.dtype)))
+
+        return (samples @ self._matrix).astype(np.float32, copy=False)
+
+
+class Mixer:
+    """
+
+    Mixing of many sounds into one, each with its own start time, gain, and
+    pan.
+
+    The length of the output is determined once, and all entries are added
+    into one output buffer, block by block. Entries with a different sample
+    rate are resampled while they are mixed.
+
+    Parameters
+    ----------
+    entries : list of (sound, start_time, gain, pan) tuples; see "add"
+    rate : sample rate of the output. Default is the rate of the first entry.
+    numChannels : number of channels of the output
+
+    Notes
+    -----
+    MixerProperties:
+        - entries
+        - rate
+        - numChannels
+        - totalSamples
+        - duration
+
+    MixerMethods:
+        - add
+        - render
+        - render_stream
+
+    Examples
+    --------
+    >>> from sksound.sounds import Sound, Mixer
+    >>> mixer = Mixer([(Sound('drums.wav'), 0, 1.0, 0),
+    >>>                (Sound('voice.wav'), 2.5, 0.8, -0.3)])
+    >>> mixer.add(Sound('birds.mp3'), start_time=10, gain=0.2, pan=0.8)
+    >>> scene = mixer.render()
+    >>> scene.play()
+
+    """
+
+    def __init__(self, entries: list|None = None, rate: float|None = None,
+                 numChannels: int = 2):
+        self.entries = []
+        self.rate = rate
+        self.numChannels = numChannels
+
+        for entry in entries or []:
+            self.add(*entry)
+
+
+    def add(self, sound: 'Sound|SoundStream', start_time: float = 0.,
+            gain: float = 1., pan: float = 0.):
+        """
+        Add a sound to the mix.
+
+        Parameters
+        ----------
+        sound : Sound, or SoundStream for sounds that do not fit into memory.
+            The length of the sound has to be known.
+        start_time : start of the sound in the mix [sec]
+        gain : linear gain factor
+        pan : position between left (-1) and right (1), for a stereo
+            output. Mono sounds are panned with constant power; for stereo
+            sounds the balance is changed.
+        """
+
+        if start_time < 0:
+            raise ValueError('"start_time" cannot be negative!')
+        if sound.totalSamples is None:
+            raise ValueError('The length of "{0}" is unknown, and it cannot be '
+                             'mixed!'.format(getattr(sound, 'source', sound)))
+        _mix_matrix(sound.numChannels, self.numChannels, gain, pan)
+
+        if self.rate is None:
+            self.rate = sound.rate
+        self.entries.append((sound, start_time, gain, pan))
+
+
+    def _tracks(self) -> list:
+        """ Readers for all entries """
+        return [_MixerTrack(sound, start_time, gain, pan, self.rate, self.numChannels)
+                for (sound, start_time, gain, pan) in self.entries]
+
+
+    @staticmethod
+    def _total(tracks: list) -> int:
+        """ Number of output samples for the given tracks """
+        return max([track.start + track.length for track in tracks], default=0)
+
+
+    @property
+    def totalSamples(self) -> int:
+        return self._total(self._tracks())
+
+
+    @property
+    def duration(self) -> float:
+        return self.totalSamples / self.rate if self.entries else 0.
+
+
+    def render_stream(self, block_size: int = 2**16, fmt: str = 'float32') -> Generator:
+        """
+        Mix the entries block by block, for scenes that do not fit into memory.
+
+        Parameters
+        ----------
+        block_size : number of samples per block
+        fmt : 'float32', or 'int16'. With 'int16', the entries are scaled to
+            int16 and summed in an int32-buffer, so that the sum cannot
+            overflow; it is clipped only once, for the output.
+
+        Returns
+        -------
+        blocks : generator, yielding arrays with the shape (numSamples,
+            numChannels) (float32-blocks are views of the output buffer,
+            which are only valid until the next block)
+
+        Examples
+        --------
+        >>> with WavWriter('scene.wav', mixer.rate, mixer.numChannels, 'float32') as writer:
+        >>>     for block in mixer.render_stream():
+        >>>         writer.write(block)
+
+        """
+
+        if fmt not in ('float32', 'int16'):
+            raise ValueError('"fmt" has to be "float32" or "int16"!')
+
+        yield from self._mix(self._tracks(), block_size, fmt)
+
+
+    def _mix(self, tracks: list, block_size: int, fmt: str) -> Generator:
+        """ Mix the given tracks block by block; see "render_stream" """
+
+        total = self._total(tracks)
+        buffer = np.empty((block_size, self.numChannels),
+                          dtype=np.float32 if fmt == 'float32' else np.int32)
+
+        for first in range(0, total, block_size):
+            last = min(first + block_size, total)
+            mix = buffer[:last - first]
+            mix[:] = 0
+
+            for track in tracks:
+                start = max(first, track.start)
+                stop = min(last, track.start + track.length)
+                if start >= stop:
+                    continue
+                samples = track.read(stop - start)
+                if fmt == 'float32':
+                    mix[start-first:stop-first] += samples
+                else:
+                    samples *= 2**15
+                    mix[start-first:stop-first] += np.rint(samples).astype(np.int32)
+
+            if fmt == 'float32':
+                yield mix
+            else:
+                yield np.clip(mix, -2**15, 2**15 - 1).astype(np.int16)
+
+
+    def render(self, fmt: str = 'float32', block_size: int = 2**16) -> 'Sound':
+        """
+        Mix all entries into a new Sound.
+
+        Parameters
+        ----------
+        fmt : 'float32' or 'int16'; see "render_stream"
+        block_size : number of samples that are mixed at a time
+
+        Returns
+        -------
+        mix : Sound, with "numChannels" channels at the rate "rate"
+        """
+
+        if fmt not in ('float32', 'int16'):
+            raise ValueError('"fmt" has to be "float32" or "int16"!')
+
+        # The tracks (and their resampling filters) are only set up once
+        tracks = self._tracks()
+        out = np.empty((self._total(tracks), self.numChannels), dtype=fmt)
+        position = 0
+        for block in self._mix(tracks, block_size, fmt):
+            out[position:position+len(block)] = block
+            position += len(block)
+
+        if self.numChannels == 1:
+            out = out[:, 0]
+        if fmt == 'float32':
+            return Sound(inData=out, inRate=self.rate, dtype='float32')
+        else:
+            return Sound(inData=out, inRate=self.rate)
+
+
+class SoundBatch:
+    """
+
+    Many (short) sounds, stored in one contiguous, zero-padded array.
+
+    Gain, normalisation, resampling, and the conversion for writing are
+    applied to the whole batch at once, instead of clip by clip.
+
+    Parameters
+    ----------
+    data : array with the shape (numClips, maxSamples) for mono, and
+        (numClips, maxSamples, numChannels) otherwise. Clip "i" consists of
+        the first "lengths[i]" samples of "data[i]"; the rest has to be zero.
+    lengths : number of samples of each clip. Default is "maxSamples" for
+        all clips.
+    rates : sample rate, either common to all clips, or one for each clip
+    sources : names of the files the clips come from (optional)
+
+    Notes
+    -----
+    SoundBatchProperties:
+        - data
+        - lengths
+        - rates
+        - sources
+        - numClips
+        - numChannels
+        - durations
+
+    SoundBatchMethods:
+        - from_sounds
+        - read
+        - to_sounds
+        - apply_gain
+        - normalize
+        - resample
+        - write
+
+    Indexing a SoundBatch returns the corresponding clip as a Sound.
+
+    Examples
+    --------
+    >>> from pathlib import Path
+    >>> from sksound.sounds import SoundBatch
+    >>> batch, errors = SoundBatch.read(sorted(Path('clips').glob('*.mp3')))
+    >>> batch.resample(16000)
+    >>> batch.normalize(level=0.5)
+    >>> batch.write('clips_16k')
+    >>> first = batch[0]        # a Sound
+
+    """
+
+    def __init__(self, data: np.ndarray, lengths: np.ndarray|None = None,
+                 rates: float|np.ndarray = 44100, sources: list|None = None):
+        """ Check the shapes, and set the properties """
+
+        data = np.asarray(data)
+        if data.ndim not in (2, 3):
+            raise ValueError('"data" has to have the shape (numClips, maxSamples[, numChannels])!')
+        num_clips = data.shape[0]
+
+        if lengths is None:
+            lengths = np.full(num_clips, data.shape[1])
+        lengths = np.asarray(lengths, dtype=np.int64)
+        if lengths.shape != (num_clips,) or np.any(lengths > data.shape[1]):
+            raise ValueError('"lengths" does not fit the shape of "data"!')
+
+        if sources is None:
+            sources = [None] * num_clips
+        elif len(sources) != num_clips:
+            raise ValueError('"sources" has to contain one entry per clip!')
+
+        self.data = data
+        self.lengths = lengths
+        self.rates = np.broadcast_to(np.asarray(rates), (num_clips,)).copy()
+        self.sources = list(sources)
+
+
+    @classmethod
+    def from_sounds(cls, sounds: list, dtype=None) -> 'SoundBatch':
+        """
+        Collect Sound objects in a SoundBatch.
+
+        Parameters
+        ----------
+        sounds : list of Sound objects, all with the same number of channels
+        dtype : data type of the batch. Default is the common type of the
+            sound data.
+
+        Returns
+        -------
+        batch : SoundBatch
+        """
+
+        num_channels = {sound.numChannels for sound in sounds}
+        if len(num_channels) > 1:
+            raise ValueError('All sounds need the same number of channels!')
+
+        if dtype is None and len(sounds) == 0:
+            dtype = np.int16
+        elif dtype is None:
+            dtype = np.result_type(*[sound.data.dtype for sound in sounds])
+        lengths = np.array([len(sound.data) for sound in sounds], dtype=np.int64)
+        max_samples = int(lengths.max()) if len(sounds) else 0
+        channel_shape = () if num_channels in ({1}, set()) else (num_channels.pop(),)
+
+        data = np.zeros((len(sounds), max_samples) + channel_shape, dtype=dtype)
+        for (clip, sound) in zip(data, sounds):
+            clip[:len(sound.data)] = sound.data
+
+        return cls(data, lengths, [sound.rate for sound in sounds],
+                   [sound.source for sound in sounds])
+
+
+    @classmethod
+    def read(cls, paths: list, workers: int|None = None, progress: bool = False,
+             cache: 'bool|DecodeCache' = False) -> tuple['SoundBatch', list]:
+        """
+        Read many sound-files concurrently (see "read_many") into a SoundBatch.
+
+        Returns
+        -------
+        batch : SoundBatch with the files that could be read, in the order
+            of "paths". It is empty if no file could be read.
+        errors : list of (path, exception) tuples, for the files that could
+            not be read. Files with another number of channels than the
+            first file that could be read are also listed here.
+        """
+
+        (sounds, read_errors) = read_many(paths, workers=workers, progress=progress,
+                                          cache=cache)
+        read_errors = dict(read_errors)
+
+        clips = []
+        errors = []
+        for (path, sound) in zip(paths, sounds):
+            if sound is None:
+                errors.append((path, read_errors[path]))
+            elif clips and sound.numChannels != clips[0].numChannels:
+                errors.append((path, ValueError('{0} channels, instead of {1}!'.format(
+                    sound.numChannels, clips[0].numChannels))))
+            else:
+                clips.append(sound)
+
+        return (cls.from_sounds(clips), errors)
+
+
+    @property
+    def numClips(self) -> int:
+        return self.data.shape[0]
+
+
+    @property
+    def numChannels(self) -> int:
+        return 1 if self.data.ndim == 2 else self.data.shape[2]
+
+
+    @property
+    def durations(self) -> np.ndarray:
+        """ Duration of each clip [sec] """
+        return self.lengths / self.rates
+
+
+    def __len__(self) -> int:
+        return self.numClips
+
+
+    def __getitem__(self, index: int) -> 'Sound':
+        """ Clip "index" as a Sound. For integer and float32 batches, its data
+        are a view into the batch; float64 data are converted to float32. """
+
+        if np.issubdtype(self.data.dtype, np.integer):
+            sound = Sound(inData=self.data[index, :self.lengths[index]],
+                          inRate=self.rates[index].item())
+        else:
+            sound = Sound(inData=self.data[index, :self.lengths[index]],
+                          inRate=self.rates[index].item(), dtype='float32')
+        sound.source = self.sources[index]
+        return sound
+
+
+    def to_sounds(self) -> list:
+        """ All clips, as a list of Sound objects """
+        return [self[index] for index in range(self.numClips)]
+
+
+    def _per_clip(self, values) -> np.ndarray:
+        """ Scalar or per-clip "values", shaped for broadcasting against "data" """
+
+        values = np.broadcast_to(np.asarray(values, dtype=np.float64), (self.numClips,))
+        return values.reshape((-1,) + (1,) * (self.data.ndim - 1))
+
+
+    def apply_gain(self, gain: float|np.ndarray):
+        """
+        Multiply the clips by a (linear) gain.
+
+        Parameters
+        ----------
+        gain : common gain for all clips, or one value for each clip
+
+        Notes
+        -----
+        The data type is kept: integer data are rounded and clipped.
+        """
+
+        computed = self.data.astype(_float_type(self.data.dtype))
+        computed *= self._per_clip(gain)
+        self.data = _cast_like(computed, self.data.dtype)
+
+
+    def normalize(self, level: float = 1.0, mode: str = 'peak'):
+        """
+        Scale each clip to the same peak- or RMS-level.
+
+        Parameters
+        ----------
+        level : peak- or RMS-level after the normalisation, relative to full
+            scale
+        mode : 'peak' or 'rms'
+
+        Notes
+        -----
+        Silent clips are left unchanged. The RMS-value is computed over the
+        samples of the clip only, not over the padding.
+        """
+
+        axes = tuple(range(1, self.data.ndim))
+        if mode == 'peak':
+            # "abs" would overflow for the most negative integer
+            reference = np.maximum(self.data.max(axis=axes, initial=0).astype(np.float64),
+                                   -self.data.min(axis=axes, initial=0).astype(np.float64))
+        elif mode == 'rms':
+            values = self.data.reshape(self.numClips, -1).astype(np.float64)
+            squares = np.einsum('ij,ij->i', values, values)
+            num_values = np.maximum(self.lengths * self.numChannels, 1)
+            reference = np.sqrt(squares / num_values)
+        else:
+            raise ValueError('"mode" has to be "peak" or "rms"!')
+
+        if np.issubdtype(self.data.dtype, np.integer):
+            full_scale = np.iinfo(self.data.dtype).max
+        else:
+            full_scale = 1
+        gain = np.ones(self.numClips)
+        np.divide(level * full_scale, reference, out=gain, where=reference > 0)
+        self.apply_gain(gain)
+
+
+    def resample(self, target_rate: float, quality: str = 'medium'):
+        """
+        Change the sample rate of all clips to "target_rate".
+
+        Parameters
+        ----------
+        target_rate : new sample rate
+        quality : 'low', 'medium', or 'high'; see "Sound.resample"
+
+        Notes
+        -----
+        All clips with the same sample rate are resampled together, with a
+        single call of "scipy.signal.resample_poly" along the time axis.
+        The data type of the batch is kept.
+        """
+
+        from scipy.signal import resample_poly
+
+        groups = []
+        for rate in np.unique(self.rates):
+            (up, down) = _resample_ratio(rate, target_rate)
+            selected = np.flatnonzero(self.rates == rate)
+            if up == down:
+                resampled = self.data[selected]
+            else:
+                h = _resample_filter(up, down, quality)
+                resampled = resample_poly(self.data[selected], up, down, axis=1,
+                                          window=h)
+            lengths = -(-self.lengths[selected] * up // down)
+            groups.append((selected, resampled, lengths, rate * up / down))
+
+        max_samples = max([int(lengths.max(initial=0)) for (_, _, lengths, _) in groups],
+                          default=0)
+        data = np.zeros((self.numClips, max_samples) + self.data.shape[2:],
+                        dtype=self.data.dtype)
+        for (selected, resampled, lengths, rate) in groups:
+            num_samples = min(resampled.shape[1], max_samples)
+            data[selected, :num_samples] = _cast_like(resampled[:, :num_samples],
+                                                      self.data.dtype)
+            self.lengths[selected] = lengths
+            self.rates[selected] = rate
+
+        # The filter tails reach into the padding, which has to stay zero
+        data[np.arange(max_samples) >= self.lengths[:, np.newaxis]] = 0
+        self.data = data
+
+
+    def write(self, out_dir: str|os.PathLike, names: list|None = None,
+              fmt: str|None = None) -> list:
+        """
+        Write each clip to a WAV-file.
+
+        Parameters
+        ----------
+        out_dir : directory for the WAV-files. It is created if necessary.
+        names : file names of the clips. Default is the name of the source
+            with the extension ".wav", or "clip_<index>.wav".
+        fmt : format of float data ('int16', 'int24', 'int32', 'float32');
+            they are taken to be in the range [-1, 1]. Default is the format
+            of the batch.
+
+        Returns
+        -------
+        out_files : list of the paths of the written files
+        """
+
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+        if names is None:
+            names = [('clip_{0:04d}.wav'.format(index) if source is None
+                      else Path(source).stem + '.wav')
+                     for (index, source) in enumerate(self.sources)]
+        elif len(names) != self.numClips:
+            raise ValueError('"names" has to contain one entry per clip!')
+
+        # One conversion for the whole batch
+        data = self.data
+        if fmt is not None and not np.issubdtype(data.dtype, np.integer):
+            chunk_size = max(1, 2**16 // max(data.shape[1], 1))
+            data = convert_float(data, fmt=fmt, normalize=None, chunk_size=chunk_size)
+        data = data.astype(data.dtype.newbyteorder('<'), copy=False)
+
+        out_files = []
+        for (clip, length, rate, name) in zip(data, self.lengths, self.rates, names):
+            out_file = out_dir / name
+            with open(out_file, 'wb') as fid:
+                fid.write(_wav_header(rate, self.numChannels, data.dtype, int(length)))
+                fid.write(memoryview(np.ascontiguousarray(clip[:length])).cast('B'))
+            out_files.append(out_file)
+
+        print(f'{len(out_files)} clips written to {out_dir}')
+        return out_files
+
+
+class RingBuffer:
+    """
+
+    Pre-allocated ring buffer for sound data, with one writer (e.g. the
+    callback of an audio device) and one reader.
+
+    No locks are used: only the writer changes the write-position, and only
+    the reader changes the read-position. Blocks that do not fit into the
+    free space are dropped, and counted as overruns.
+
+    Parameters
+    ----------
+    capacity : number of samples that the buffer can hold
+    numChannels : number of channels
+    dtype : data type of the samples
+
+    Notes
+    -----
+    RingBufferProperties:
+        - capacity
+        - available (samples that can be read)
+        - overruns (number of blocks that did not fit completely)
+        - droppedSamples
+
+    RingBufferMethods:
+        - write
+        - peek
+        - advance
+        - read
+
+    Examples
+    --------
+    >>> ring = RingBuffer(8192, numChannels=2, dtype='int16')
+    >>> ring.write(block)                   # in the producer
+    >>> if ring.available >= 1024:          # in the consumer
+    >>>     process(ring.peek(1024))
+    >>>     ring.advance(1024)
+
+    """
+
+    def __init__(self, capacity: int, numChannels: int = 1, dtype: str = 'float32'):
+        """ Allocate the buffer """
+
+        if capacity < 1:
+            raise ValueError('"capacity" has to be positive!')
+
+        channel_shape = () if numChannels == 1 else (numChannels,)
+        self._buffer = np.zeros((capacity,) + channel_shape, dtype=dtype)
+        self.capacity = capacity
+        self.numChannels = numChannels
+        self.overruns = 0
+        self.droppedSamples = 0
+
+        # Total number of samples written/read so far
+        self._written = 0
+        self._read = 0
+
+
+    @property
+    def available(self) -> int:
+        return self._written - self._read
+
+
+    def write(self, block: np.ndarray) -> int:
+        """
+        Copy a block of samples into the buffer.
+
+        Parameters
+        ----------
+        block : array with the shape (numSamples,) for mono, and
+            (numSamples, numChannels) otherwise. (numSamples, 1) is also
+            accepted for mono.
+
+        Returns
+        -------
+        num_written : number of samples that fitted into the buffer
+        """
+
+        block = np.asarray(block).reshape((-1,) + self._buffer.shape[1:])
+        num_samples = min(len(block), self.capacity - self.available)
+        if num_samples < len(block):
+            self.overruns += 1
+            self.droppedSamples += len(block) - num_samples
+
+        start = self._written % self.capacity
+        first = min(num_samples, self.capacity - start)
+        self._buffer[start:start+first] = block[:first]
+        self._buffer[:num_samples-first] = block[first:num_samples]
+
+        # Only publish the samples once they are in the buffer
+        self._written += num_samples
+        return num_samples
+
+
+    def peek(self, num_samples: int) -> np.ndarray:
+        """
+        View of the next "num_samples" samples, without copying them.
+
+        The view stays valid until "advance" is called. Since it cannot wrap
+        around the end of the buffer, it may contain fewer samples than
+        requested: choose a "capacity" that is a multiple of "num_samples"
+        to always get complete blocks.
+        """
+
+        start = self._read % self.capacity
+        num_samples = min(num_samples, self.available, self.capacity - start)
+        return self._buffer[start:start+num_samples]
+
+
+    def advance(self, num_samples: int):
+        """ Release the next "num_samples" samples, after they have been used """
+
+        if num_samples > self.available:
+            raise ValueError('Only {0} samples are available!'.format(self.available))
+        self._read += num_samples
+
+
+    def read(self, num_samples: int) -> np.ndarray:
+        """ Copy of (at most) the next "num_samples" samples, which are released """
+
+        num_samples = min(num_samples, self.available)
+        out = np.empty((num_samples,) + self._buffer.shape[1:], dtype=self._buffer.dtype)
+        num_copied = 0
+        while num_copied < num_samples:
+            block = self.peek(num_samples - num_copied)
+            out[num_copied:num_copied+len(block)] = block
+            num_copied += len(block)
+            self.advance(len(block))
+        return out
+
+
+class LoopbackInput:
+    """
+
+    Input device without hardware, which plays back a given signal.
+
+    It replaces "sounddevice.InputStream" in a "Recorder": the signal is
+    delivered block by block to the callback, from a separate thread, like
+    the data of a microphone. This allows recordings to be tested without
+    an audio device.
+
+    Parameters
+    ----------
+    data : signal that is "recorded", with the shape (numSamples,) or
+        (numSamples, numChannels)
+    realtime : if True, the blocks are delivered at the sample rate;
+        otherwise as fast as possible
+    loop : if True, the signal is repeated until the stream is stopped
+
+    Examples
+    --------
+    >>> from sksound.sounds import Sound, LoopbackInput
+    >>> signal = np.int16(np.random.randn(44100) * 1000)
+    >>> recorded = Sound.record(1.0, rate=44100, stream_factory=LoopbackInput(signal))
+
+    """
+
+    def __init__(self, data: np.ndarray, realtime: bool = False, loop: bool = False):
+        """ Store the signal """
+
+        data = np.asarray(data)
+        self.data = data.reshape((len(data), -1))
+        self.realtime = realtime
+        self.loop = loop
+        self._thread = None
+        self._running = False
+
+
+    def __call__(self, samplerate: float, channels: int, dtype: str, blocksize: int,
+                 callback, device=None) -> 'LoopbackInput':
+        """ Open the stream, with the arguments of "sounddevice.InputStream" """
+
+        if channels != self.data.shape[1]:
+            raise ValueError('The loopback signal has {0} channels, not {1}!'.format(
+                self.data.shape[1], channels))
+
+        self.samplerate = samplerate
+        self.dtype = np.dtype(dtype)
+        self.blocksize = blocksize
+        self.callback = callback
+        return self
+
+
+    def start(self):
+        """ Start delivering blocks to the callback """
+
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+
+    def stop(self):
+        """ Stop delivering blocks, and wait for the thread to finish """
+
+        self._running = False
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+
+    def close(self):
+        self.stop()
+
+
+    @property
+    def active(self) -> bool:
+        """ Like "sounddevice.InputStream.active": False once the signal has ended """
+        return self._running
+
+
+    def _run(self):
+        """ Deliver the signal block by block """
+
+        start_time = time.perf_counter()
+        position = 0
+        while self._running and (self.loop or position < len(self.data)):
+            indices = np.arange(position, position + self.blocksize)
+            if self.loop:
+                indices %= len(self.data)
+            else:
+                indices = indices[indices < len(self.data)]
+            self.callback(self.data[indices].astype(self.dtype), len(indices), None, None)
+            position += len(indices)
+
+            if self.realtime:
+                delay = start_time + position/self.samplerate - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+        self._running = False
+
+
+class Recorder:
+    """
+
+    Streaming capture from an input device (e.g. a microphone).
+
+    The blocks from the device are written by its callback into a
+    pre-allocated "RingBuffer", and can be pulled from there without
+    copying with "iter_blocks". Blocks that arrive while the buffer is full
+    are dropped and counted as overruns.
+
+    Parameters
+    ----------
+    rate : sample rate
+    numChannels : number of channels
+    dtype : data type of the samples ('int16', 'int32', or 'float32')
+    block_size : number of samples per block, for the device and for
+        "iter_blocks"
+    buffer_duration : length of the ring buffer [sec]
+    device : input device (index or name), passed on to "sounddevice".
+        Default is the default input device.
+    stream_factory : callable that opens the input stream, with the
+        arguments of "sounddevice.InputStream" (e.g. a "LoopbackInput").
+        Default is "sounddevice.InputStream".
+    max_samples : the recording ends after this number of samples, and
+        later input is ignored. Default is no limit.
+
+    Notes
+    -----
+    Recording from hardware requires the package "sounddevice", which is
+    only imported when a recording is started.
+
+    RecorderProperties:
+        - rate
+        - numChannels
+        - dataType
+        - block_size
+        - buffer (the RingBuffer)
+        - overruns (blocks that did not fit into the ring buffer)
+        - deviceOverflows (input overflows reported by the device)
+        - totalSamples (samples received from the device so far)
+
+    RecorderMethods:
+        - start
+        - stop
+        - iter_blocks
+        - read
+
+    Examples
+    --------
+    >>> from sksound.sounds import Recorder, WavWriter
+    >>> with Recorder(rate=44100, numChannels=1) as recorder:
+    >>>     with WavWriter('recording.wav', 44100, 1) as writer:
+    >>>         for block in recorder.iter_blocks():
+    >>>             writer.write(block)
+    >>>             if writer.totalSamples > 10*44100:
+    >>>                 break
+
+    """
+
+    def __init__(self, rate: float = 44100, numChannels: int = 1, dtype: str = 'int16',
+                 block_size: int = 1024, buffer_duration: float = 10.,
+                 device=None, stream_factory=None, max_samples: int|None = None):
+        """ Allocate the ring buffer. The device is only opened by "start" """
+
+        self.rate = rate
+        self.numChannels = numChannels
+        self.dataType = str(np.dtype(dtype))
+        self.block_size = block_size
+        self.device = device
+        self.deviceOverflows = 0
+        self.totalSamples = 0
+        self.max_samples = max_samples
+
+        # A multiple of "block_size", so that blocks never wrap around
+        num_blocks = max(int(np.ceil(buffer_duration * rate / block_size)), 2)
+        self.buffer = RingBuffer(num_blocks * block_size, numChannels, self.dataType)
+
+        self._stream_factory = stream_factory
+        self._stream = None
+
+
+    @property
+    def overruns(self) -> int:
+        return self.buffer.overruns
+
+
+    @property
+    def is_recording(self) -> bool:
+        return (self._stream is not None and getattr(self._stream, 'active', True)
+                and not self._complete)
+
+
+    @property
+    def _complete(self) -> bool:
+        return self.max_samples is not None and self.totalSamples >= self.max_samples
+
+
+    def _callback(self, indata, frames, time_info, status):
+        """ Called by the device, from its own thread, for each block """
+
+        if self._complete:
+            return
+        if status:
+            self.deviceOverflows += 1
+        if self.max_samples is not None:
+            indata = indata[:self.max_samples - self.totalSamples]
+        self.buffer.write(indata)
+        self.totalSamples += len(indata)
+
+
+    def start(self):
+        """ Open the input device, and start recording """
+
+        if self._stream is not None:
+            return
+
+        stream_factory = self._stream_factory
+        if stream_factory is None:
+            import sounddevice
+            stream_factory = sounddevice.InputStream
+
+        self._stream = stream_factory(samplerate=self.rate, channels=self.numChannels,
+                                      dtype=self.dataType, blocksize=self.block_size,
+                                      callback=self._callback, device=self.device)
+        self._stream.start()
+
+
+    def stop(self):
+        """ Stop recording, close the device, and report overruns """
+
+        if self._stream is None:
+            return
+
+        self._stream.stop()
+        self._stream.close()
+        self._stream = None
+
+        if self.overruns or self.deviceOverflows:
+            print('Recording: {0} samples dropped in {1} overruns, {2} device overflows'.format(
+                self.buffer.droppedSamples, self.overruns, self.deviceOverflows))
+
+
+    def iter_blocks(self, timeout: float|None = None) -> Generator:
+        """
+        Iterate over the recorded data, as they come in.
+
+        Parameters
+        ----------
+        timeout : stop iterating if no new data arrive for "timeout" seconds.
+            Default is to wait as long as the recording runs.
+
+        Returns
+        -------
+        blocks : generator, yielding views into the ring buffer, with
+            "block_size" samples. A view is only valid until the next block
+            is requested. After the recording has stopped, the remaining
+            data are yielded (the last block can be shorter).
+        """
+
+        poll_interval = self.block_size / self.rate / 4
+        last_data = time.perf_counter()
+        while True:
+            if self.buffer.available >= self.block_size or \
+                    (self.buffer.available and not self.is_recording):
+                block = self.buffer.peek(self.block_size)
+                yield block
+                self.buffer.advance(len(block))
+                last_data = time.perf_counter()
+            elif not self.is_recording:
+                return
+            elif timeout is not None and time.perf_counter() - last_data > timeout:
+                return
+            else:
+                time.sleep(poll_interval)
+
+
+    def read(self, num_samples: int) -> np.ndarray:
+        """
+        Wait until "num_samples" samples have been recorded, and return them.
+        If the recording stops before, the data recorded so far are returned.
+        """
+
+        channel_shape = () if self.numChannels == 1 else (self.numChannels,)
+        out = np.empty((num_samples,) + channel_shape, dtype=self.dataType)
+        num_read = 0
+        for block in self.iter_blocks():
+            num_used = min(len(block), num_samples - num_read)
+            out[num_read:num_read+num_used] = block[:num_used]
+            num_read += num_used
+            if num_read == num_samples:
+                break
+        return out[:num_read]
+
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+# Filter parameters for the resampling: (half-length factor, Kaiser-beta)
+_RESAMPLE_QUALITY = {'low': (4, 5.0),
+                     'medium': (10, 5.0),
+                     'high': (20, 8.0)}
+
+
+def _resample_ratio(rate: float, target_rate: float) -> tuple[int, int]:
+    """ Ratio target_rate/rate, as a fraction up/down """
+
+    ratio = Fraction(target_rate) / Fraction(rate)
+    ratio = ratio.limit_denominator(10000)
+    return (ratio.numerator, ratio.denominator)
+
+
+def _resample_filter(up: int, down: int, quality: str) -> np.ndarray:
+    """ Anti-aliasing low-pass filter for polyphase resampling by up/down.
+    (The default of "scipy.signal.resample_poly" corresponds to 'medium'.) """
+
+    from scipy.signal import firwin
+
+    if quality not in _RESAMPLE_QUALITY:
+        raise ValueError('"quality" has to be one of {0}!'.format(list(_RESAMPLE_QUALITY)))
+    (factor, beta) = _RESAMPLE_QUALITY[quality]
+
+    max_rate = max(up, down)
+    half_len = factor * max_rate
+    return firwin(2*half_len + 1, 1./max_rate, window=('kaiser', beta))
+
+
+def _stft_window(window: str|np.ndarray, frame_size: int) -> np.ndarray:
+    """ Periodic window of length "frame_size", from its name or its values """
+
+    if isinstance(window, str):
+        from scipy.signal import get_window
+        return get_window(window, frame_size, fftbins=True)
+
+    window = np.asarray(window, dtype=np.float64)
+    if window.shape != (frame_size,):
+        raise ValueError('The window needs {0} values!'.format(frame_size))
+    return window
+
+
+def _stft(data: np.ndarray, window: np.ndarray, hop: int, dtype: str = 'float32',
+          chunk_size: int = 2**20) -> np.ndarray:
+    """
+    Short-time Fourier transform of all complete frames of "data".
+
+    The frames are a strided view of "data", and are transformed with one
+    rFFT per chunk of (about) "chunk_size" values, instead of frame by frame.
+    Integer data are scaled to the range [-1, 1] together with the
+    windowing, so they are never converted as a whole.
+
+    Returns
+    -------
+    spectra : complex array, (numFrames, numFreqs[, numChannels])
+    """
+
+    from scipy.fft import rfft
+
+    if dtype not in ('float32', 'float64'):
+        raise ValueError('"dtype" has to be "float32" or "float64"!')
+    if data.dtype == np.uint8:
+        data = _to_float32(data)
+
+    frame_size = len(window)
+    if np.issubdtype(data.dtype, np.integer):
+        window = window / 2**(8*data.dtype.itemsize - 1)
+    window = window.astype(dtype)
+
+    num_frames = max((len(data) - frame_size) // hop + 1, 0)
+    spectra = np.empty((num_frames, frame_size//2 + 1) + data.shape[1:],
+                       dtype=np.result_type(dtype, np.complex64))
+    if num_frames == 0:
+        return spectra
+
+    # (numFrames, [numChannels,] frame_size), without copying
+    frames = np.lib.stride_tricks.sliding_window_view(data, frame_size, axis=0)[::hop]
+
+    frames_per_chunk = max(chunk_size // frames[0].size, 1)
+    for first in range(0, num_frames, frames_per_chunk):
+        chunk = np.multiply(frames[first:first+frames_per_chunk], window, dtype=dtype)
+        transformed = rfft(chunk, axis=-1)
+        spectra[first:first+frames_per_chunk] = np.moveaxis(transformed, -1, 1)
+
+    return spectra
+
+
+def _frame_power(data: np.ndarray, frame_size: int, hop: int,
+                 chunk_size: int = 2**16) -> np.ndarray:
+    """
+    Mean square of all complete frames of "data", relative to full scale,
+    from the cumulative sum of the squared samples.
+
+    The cumulative sum is computed chunk by chunk, and only kept at the
+    frame boundaries, so the data are never converted as a whole.
+
+    Returns
+    -------
+    power : float array, (numFrames[, numChannels])
+    """
+
+    num_frames = max((len(data) - frame_size) // hop + 1, 0)
+    starts = np.arange(num_frames) * hop
+    boundaries = np.concatenate((starts, starts + frame_size))
+    order = np.argsort(boundaries, kind='stable')
+    sorted_boundaries = boundaries[order]
+
+    # Cumulative sum at the boundaries: "cumulative[k]" is the sum over data[:k]
+    cumulative = np.zeros((len(boundaries),) + data.shape[1:])
+    carry = np.zeros(data.shape[1:])
+    for first in range(0, len(data), chunk_size):
+        chunk = _to_float32(data[first:first+chunk_size]).astype(np.float64)
+        chunk **= 2
+        sums = np.cumsum(chunk, axis=0)
+        sums += carry
+        low = np.searchsorted(sorted_boundaries, first + 1, side='left')
+        high = np.searchsorted(sorted_boundaries, first + len(chunk), side='right')
+        cumulative[order[low:high]] = sums[sorted_boundaries[low:high] - first - 1]
+        carry = sums[-1]
+
+    power = cumulative[num_frames:] - cumulative[:num_frames]
+    return np.maximum(power, 0) / frame_size
+
+
+def _true_peak_envelope(data: np.ndarray, chunk_size: int = 2**16,
+                        oversampling: int = 4) -> np.ndarray:
+    """
+    For each sample, the maximum absolute value of the 4x oversampled
+    signal up to the next sample (ITU-R BS.1770-4, Annex 2), relative to
+    full scale.
+
+    The oversampling is done chunk by chunk, with enough overlap that the
+    result is the same as for the complete signal.
+
+    Returns
+    -------
+    envelope : float32-array, with the shape of "data"
+    """
+
+    from scipy.signal import resample_poly
+
+    margin = 32
+    envelope = np.empty(data.shape, dtype=np.float32)
+    for first in range(0, len(data), chunk_size):
+        last = min(first + chunk_size, len(data))
+        start = max(first - margin, 0)
+        segment = _to_float32(data[start:min(last + margin, len(data))])
+        oversampled = resample_poly(segment, oversampling, 1, axis=0)
+        offset = (first - start) * oversampling
+        oversampled = oversampled[offset:offset + (last-first)*oversampling]
+        envelope[first:last] = np.abs(oversampled).reshape(
+            (last - first, oversampling) + data.shape[1:]).max(axis=1)
+
+    return envelope
+
+
+def _k_weighting(rate: float) -> np.ndarray:
+    """
+    K-weighting filter of ITU-R BS.1770-4 for the sample rate "rate", as
+    second-order sections: a high-shelf, and the "RLB" high-pass. The
+    analog prototypes are transformed such that the coefficients for 48 kHz
+    are those of the standard.
+    """
+
+    # High-shelf
+    K = np.tan(np.pi * 1681.974450955533 / rate)
+    Q = 0.7071752369554196
+    Vh = 10**(3.999843853973347/20)
+    Vb = Vh**0.4996667741545416
+    a0 = 1 + K/Q + K**2
+    shelf = [(Vh + Vb*K/Q + K**2)/a0, 2*(K**2 - Vh)/a0, (Vh - Vb*K/Q + K**2)/a0,
+             1., 2*(K**2 - 1)/a0, (1 - K/Q + K**2)/a0]
+
+    # High-pass
+    K = np.tan(np.pi * 38.13547087602444 / rate)
+    Q = 0.5003270373238773
+    a0 = 1 + K/Q + K**2
+    highpass = [1., -2., 1., 1., 2*(K**2 - 1)/a0, (1 - K/Q + K**2)/a0]
+
+    return np.array([shelf, highpass])
+
+
+def _lufs(energy):
+    """ Loudness [LUFS] of a (weighted) mean square value """
+
+    with np.errstate(divide='ignore'):
+        return -0.691 + 10*np.log10(energy)
+
+
+def _mix_matrix(in_channels: int, out_channels: int, gain: float,
+                pan: float) -> np.ndarray:
+    """
+    Matrix (in_channels, out_channels) that maps the channels of a sound
+    to the channels of a mix, with "gain" and "pan" applied.
+    """
+
+    if not -1 <= pan <= 1:
+        raise ValueError('"pan" has to be between -1 and 1!')
+
+    if out_channels == 2 and in_channels == 1:
+        # Constant power
+        angle = (pan + 1) * np.pi/4
+        matrix = np.array([[np.cos(angle), np.sin(angle)]])
+    elif out_channels == 2 and in_channels == 2:
+        # Balance
+        matrix = np.diag([min(1, 1 - pan), min(1, 1 + pan)])
+    elif out_channels == 1:
+        matrix = np.full((in_channels, 1), 1/in_channels)
+    elif in_channels == 1:
+        matrix = np.ones((1, out_channels))
+    elif in_channels == out_channels:
+        matrix = np.eye(in_channels)
+    else:
+        raise ValueError('Cannot mix {0} channels into {1} channels!'.format(
+            in_channels, out_channels))
+
+    return (gain * matrix).astype(np.float32)
+
+
+def _float_type(dtype) -> np.dtype:
+    """ Float type for computations on data of type "dtype" """
+
+    if np.issubdtype(dtype, np.floating):
+        return np.dtype(dtype)
+    else:
+        return np.dtype(np.float64)
+
+
+def _cast_like(data: np.ndarray, dtype) -> np.ndarray:
+    """ Convert computed (float) data back to "dtype": integer types are
+    rounded and clipped """
+
+    dtype = np.dtype(dtype)
+    if np.issubdtype(dtype, np.integer):
+        info = np.iinfo(dtype)
+        data = np.clip(np.rint(data), info.min, info.max)
+    return data.astype(dtype, copy=False)
+
+
+# Target formats of "convert_float": (dtype, full scale, left-shift)
+# 24-bit data are stored in the upper three bytes of an "int32"
+_FLOAT_CONVERSIONS = {'int16': (np.int16, 2**15, 0),
+                      'int24': (np.int32, 2**23, 8),
+                      'int32': (np.int32, 2**31, 0),
+                      'float32': (np.float32, 1, 0)}
+
+
+def convert_float(data: np.ndarray, fmt: str = 'int16',
+                  normalize: str|None = 'peak', level: float = 0.25,
+                  dither: bool = False, chunk_size: int = 2**16) -> np.ndarray:
+    """
+    Convert float sound data to a PCM- or float32-format.
+
+    The conversion is done chunk by chunk, so apart from the output array
+    only temporary arrays of "chunk_size" samples are allocated.
+
+    Parameters
+    ----------
+    data : float array, with the shape (numSamples,) or (numSamples, numChannels)
+    fmt : target format:
+        - 'int16'
+        - 'int24' ... 24-bit resolution, in the upper three bytes of an int32
+        - 'int32'
+        - 'float32' ... in the range [-1, 1]
+    normalize : scaling of the data:
+        - 'peak' ... the maximum absolute value is scaled to "level"
+        - 'rms' ... the RMS-value is scaled to "level"
+        - None ... the data are taken to be in the range [-1, 1]
+    level : peak- or RMS-level after the normalisation, relative to full
+        scale. Ignored if "normalize" is None.
+    dither : if True, triangular (TPDF) dither of +/- 1 LSB is added before
+        the quantization. Ignored for 'float32'.
+    chunk_size : number of samples that are converted in one step
+
+    Returns
+    -------
+    converted : array with the dtype of the target format. Values outside
+        the range of the target format are clipped.
+
+    Examples
+    --------
+    >>> t = np.arange(0, 1, 1/44100)
+    >>> x = 3 * np.sin(2*np.pi*440*t)
+    >>> pcm = convert_float(x)                     # peak at 2**13
+    >>> pcm24 = convert_float(x, fmt='int24', normalize='rms', level=0.1, dither=True)
+
+    """
+
+    if fmt not in _FLOAT_CONVERSIONS:
+        raise ValueError('Unknown format {0}; use one of {1}'.format(
+            fmt, list(_FLOAT_CONVERSIONS)))
+    (dtype, full_scale, shift) = _FLOAT_CONVERSIONS[fmt]
+
+    num_samples = len(data)
+    chunks = [slice(start, start+chunk_size) for start in range(0, num_samples, chunk_size)]
+
+    # Determine the scale factor, in a first pass over the data
+    if normalize == 'peak':
+        reference = max([np.max(np.abs(data[chunk])) for chunk in chunks], default=0)
+    elif normalize == 'rms':
+        sum_squares = sum([np.sum(np.square(data[chunk], dtype=np.float64))
+                           for chunk in chunks])
+        reference = np.sqrt(sum_squares / max(data.size, 1))
+    elif normalize is None:
+        reference = level
+    else:
+        raise ValueError("'normalize' has to be 'peak', 'rms', or None!")
+
+    if reference == 0:
+        # Silence stays silence
+        reference = 1
+    gain = level * full_scale / reference
+
+    if dtype == np.float32:
+        (low, high) = (-1, 1)
+    else:
+        (low, high) = (-full_scale, full_scale - 1)
+
+    converted = np.empty(data.shape, dtype=dtype)
+    rng = np.random.default_rng() if dither else None
+
+    # Convert the data, in a second pass
+    for chunk in chunks:
+        scaled = np.multiply(data[chunk], gain, dtype=np.float64)
+        if dtype != np.float32:
+            if dither:
+                scaled += rng.random(scaled.shape)
+                scaled -= rng.random(scaled.shape)
+            np.rint(scaled, out=scaled)
+        np.clip(scaled, low, high, out=scaled)
+        if shift:
+            scaled *= 2**shift
+        converted[chunk] = scaled
+
+    return converted
+
+
+def probe(inFile: str|os.PathLike) -> SoundInfo:
+    """
+    Get the information about a sound-file, without reading the sound data.
+
+    Parameters
+    ----------
+    inFile : path of the sound-file
+
+    Returns
+    -------
+    info : SoundInfo
+        the same information as "Sound.get_info" (source, rate, numChannels,
+        totalSamples, duration, dataType)
+
+    Notes
+    -----
+    * For WAV-files only the RIFF/WAVE header is parsed.
+    * Other formats need a single call to "ffprobe". "totalSamples" is then
+      computed from the duration of the container (and is "None" if that is
+      unknown), and "dataType" is the type that "Sound" would produce.
+
+    Examples
+    --------
+    >>> from sksound.sounds import probe
+    >>> info = probe('test.mp3')
+    >>> print(info.duration, info.rate)
+
+    """
+
+    if not os.path.exists(inFile):
+        raise FileNotFoundError('{0} does not exist!'.format(inFile))
+
+    source = str(inFile)
+    if os.path.splitext(source)[1].lower() == '.wav':
+        with open(source, 'rb') as in_file:
+            header = _read_wav_header(in_file)
+        return SoundInfo(source, header['rate'], header['numChannels'],
+                         header['totalSamples'],
+                         float(header['totalSamples'])/header['rate'],
+                         header['dataType'])
+
+    ffmpeg_info = FFMPEG_info.cached()
+    if ffmpeg_info.ffprobe == None:
+        print('Sorry, need FFMPEG for non-WAV files!')
+        raise NoFFMPEG_Error
+
+    stream_info = _ffprobe(ffmpeg_info.ffprobe, source)
+    duration = stream_info['duration']
+    if duration is None:
+        total_samples = None
+    else:
+        total_samples = int(round(duration * stream_info['rate']))
+
+    return SoundInfo(source, stream_info['rate'], stream_info['numChannels'],
+                     total_samples, duration, 'int16')
+
+
+def probe_many(paths: list, workers: int|None = None) -> tuple[list, list]:
+    """
+    Get the information about many sound-files concurrently, without reading
+    the sound data.
+
+    Parameters
+    ----------
+    paths : list of paths to the sound-files
+    workers : maximum number of files that are probed at the same time.
+        Default is the number of CPUs.
+
+    Returns
+    -------
+    infos : list of SoundInfo, in the order of "paths". Files that could
+        not be probed give "None".
+    errors : list of (path, exception) tuples, for the files that could not
+        be probed
+
+    Examples
+    --------
+    >>> from pathlib import Path
+    >>> from sksound.sounds import probe_many
+    >>> infos, errors = probe_many(sorted(Path('library').rglob('*.mp3')), workers=16)
+    >>> total_duration = sum([info.duration for info in infos if info is not None])
+
+    """
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    # Do the FFMPEG discovery (which may be interactive) before starting the threads
+    if any(os.path.splitext(str(path))[1].lower() != '.wav' for path in paths):
+        FFMPEG_info.cached()
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    infos = []
+    errors = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(probe, path) for path in paths]
+        for path, future in zip(paths, futures):
+            try:
+                infos.append(future.result())
+            except Exception as err:
+                infos.append(None)
+                errors.append((path, err))
+
+    return (infos, errors)
+
+
+def read_many(paths: list, workers: int|None = None, progress: bool = False,
+              mmap: bool = False, cache: 'bool|DecodeCache' = False) -> tuple[list, list]:
+    """
+    Read many sound-files concurrently.
+
+    Parameters
+    ----------
+    paths : list of paths to the sound-files
+    workers : maximum number of files that are decoded at the same time
+        (and therefore of open FFMPEG-pipes). Default is the number of CPUs.
+    progress : if True, show a "misc.progressbar" on the commandline
+    mmap : passed on to "Sound"
+    cache : passed on to "Sound"
+
+    Returns
+    -------
+    sounds : list of Sound objects, in the order of "paths". Files that
+        could not be read give "None".
+    errors : list of (path, exception) tuples, for the files that could not
+        be read
+
+    Notes
+    -----
+    A thread-pool is sufficient to keep all cores busy: the decoding is done
+    in separate "ffmpeg" processes, and reading from their pipes releases
+    the GIL.
+
+    Examples
+    --------
+    >>> from pathlib import Path
+    >>> from sksound.sounds import read_many
+    >>> sounds, errors = read_many(sorted(Path('data').glob('*.mp3')), workers=8)
+    >>> for path, err in errors:
+    >>>     print(f'{path}: {err}')
+
+    """
+
+    def _read(path):
+        # "Sound" would ask interactively for a replacement of missing files
+        if not os.path.exists(path):
+            raise FileNotFoundError('{0} does not exist!'.format(path))
+        return Sound(path, mmap=mmap, cache=cache)
+
+    # Do the FFMPEG discovery (which may be interactive) before starting the threads
+    if any(os.path.splitext(str(path))[1].lower() != '.wav' for path in paths):
+        FFMPEG_info.cached()
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    if cache is True:
+        cache = DecodeCache.default()
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    sounds = []
+    errors = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_read, path) for path in paths]
+        if progress:
+            futures = misc.progressbar(futures, 'Reading ')
+
+        for path, future in zip(paths, futures):
+            try:
+                sounds.append(future.result())
+            except Exception as err:
+                sounds.append(None)
+                errors.append((path, err))
+
+    return (sounds, errors)
 
 
 def main():
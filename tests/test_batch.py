@@ -0,0 +1,91 @@
+""" SoundBatch: vectorised operations on many clips """
+
+import numpy as np
+import pytest
+from scipy.io import wavfile
+from scipy.signal import resample_poly
+
+from sksound.sounds import Sound, SoundBatch
+
+
+def make_sounds():
+    rng = np.random.default_rng(1234)
+    return [Sound(inData=np.int16(rng.uniform(-1, 1, (num_samples, 2)) * 2**12),
+                  inRate=rate)
+            for (num_samples, rate) in [(1000, 8000), (700, 16000), (1200, 8000)]]
+
+
+def test_from_sounds_and_getitem():
+    sounds = make_sounds()
+    batch = SoundBatch.from_sounds(sounds)
+
+    assert batch.data.shape == (3, 1200, 2)
+    np.testing.assert_array_equal(batch.lengths, [1000, 700, 1200])
+    np.testing.assert_array_equal(batch.rates, [8000, 16000, 8000])
+    np.testing.assert_array_equal(batch.data[1, 700:], 0)
+
+    clip = batch[1]
+    assert (clip.rate, clip.totalSamples, clip.dataType) == (16000, 700, 'int16')
+    np.testing.assert_array_equal(clip.data, sounds[1].data)
+    assert np.shares_memory(clip.data, batch.data)
+
+
+def test_peak_normalisation_with_most_negative_integer():
+    batch = SoundBatch(np.int16([[-32768, 100, 0], [0, 50, -25]]))
+    batch.normalize(0.5)
+
+    np.testing.assert_array_equal(batch.data, [[-16384, 50, 0], [0, 16384, -8192]])
+
+
+def test_rms_normalisation_ignores_the_padding():
+    rng = np.random.default_rng(1234)
+    data = rng.uniform(-1, 1, (2, 100))
+    data[1, 40:] = 0
+    batch = SoundBatch(data, lengths=[100, 40], rates=1000)
+    batch.normalize(0.1, mode='rms')
+
+    assert np.sqrt(np.mean(batch.data[0]**2)) == pytest.approx(0.1)
+    assert np.sqrt(np.mean(batch.data[1, :40]**2)) == pytest.approx(0.1)
+
+
+def test_resample_matches_resample_poly():
+    sounds = make_sounds()
+    batch = SoundBatch.from_sounds(sounds, dtype=np.float64)
+    batch.resample(12000)
+
+    np.testing.assert_array_equal(batch.rates, 12000)
+    np.testing.assert_array_equal(batch.lengths, [1500, 525, 1800])
+    for (index, sound) in enumerate(sounds):
+        (up, down) = (3, 2) if sound.rate == 8000 else (3, 4)
+        expected = resample_poly(sound.data.astype(np.float64), up, down, axis=0)
+        length = batch.lengths[index]
+        np.testing.assert_allclose(batch.data[index, :length], expected, atol=1e-9)
+        np.testing.assert_array_equal(batch.data[index, length:], 0)
+
+
+def test_write_int24(tmp_path):
+    data = np.array([[0.5, -1., 0.25, 0.], [1., -0.5, 0., 0.]])
+    batch = SoundBatch(data, lengths=[4, 2], rates=8000, sources=['a.mp3', None])
+    out_files = batch.write(tmp_path, fmt='int24')
+
+    assert [out_file.name for out_file in out_files] == ['a.wav', 'clip_0001.wav']
+    (rate, written) = wavfile.read(out_files[0])
+    assert (rate, written.dtype) == (8000, np.int32)
+    np.testing.assert_array_equal(written, np.array([2**22, -2**23, 2**21, 0]) * 2**8)
+    np.testing.assert_array_equal(wavfile.read(out_files[1])[1],
+                                  np.array([2**23 - 1, -2**22]) * 2**8)
+
+
+def test_read_keeps_the_errors(tmp_path):
+    wavfile.write(tmp_path / 'stereo.wav', 8000, np.zeros((100, 2), np.int16))
+    wavfile.write(tmp_path / 'mono.wav', 8000, np.zeros(50, np.int16))
+    paths = [tmp_path / 'missing.wav', tmp_path / 'stereo.wav', tmp_path / 'mono.wav']
+
+    (batch, errors) = SoundBatch.read(paths)
+    assert len(batch) == 1 and batch.numChannels == 2
+    assert [path for (path, _) in errors] == [paths[0], paths[2]]
+    assert isinstance(errors[0][1], FileNotFoundError)
+    assert isinstance(errors[1][1], ValueError)
+
+    (batch, errors) = SoundBatch.read(paths[:1])
+    assert len(batch) == 0 and len(errors) == 1
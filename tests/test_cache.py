@@ -0,0 +1,54 @@
+""" On-disk cache of decoded sound data """
+
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from sksound.sounds import DecodeCache
+
+
+@pytest.fixture
+def in_file(tmp_path):
+    in_file = tmp_path / 'sound.mp3'
+    in_file.write_bytes(b'not really an mp3')
+    return in_file
+
+
+def test_store_and_load(tmp_path, in_file):
+    cache = DecodeCache(tmp_path / 'cache')
+    data = np.arange(20, dtype=np.int16).reshape(-1, 2)
+    cache.store(in_file, {'format': 's16le'}, 8000, data)
+
+    (rate, loaded) = cache.load(in_file, {'format': 's16le'})
+    assert rate == 8000
+    np.testing.assert_array_equal(loaded, data)
+    assert cache.load(in_file, {'format': 'f32le'}) is None
+
+
+def test_oversized_entries_are_not_stored(tmp_path, in_file):
+    cache = DecodeCache(tmp_path / 'cache', max_size=10000)
+    cache.store(in_file, {'start': 0}, 8000, np.zeros(1000, dtype=np.int16))
+    cache.store(in_file, {'start': 1}, 8000, np.zeros(6000, dtype=np.int16))
+
+    # The small entry is kept, the large one is skipped
+    assert cache.load(in_file, {'start': 0}) is not None
+    assert cache.load(in_file, {'start': 1}) is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, in_file):
+    cache = DecodeCache(tmp_path / 'cache', max_size=5000)
+    for start in range(3):
+        cache.store(in_file, {'start': start}, 8000, np.zeros(1000, dtype=np.int16))
+
+    assert cache.load(in_file, {'start': 0}) is None
+    assert cache.load(in_file, {'start': 2}) is not None
+
+
+def test_failed_writes_leave_no_temporary_files(tmp_path, in_file):
+    cache = DecodeCache(tmp_path / 'cache')
+    with mock.patch('numpy.save', side_effect=OSError('disk full')):
+        with pytest.raises(OSError):
+            cache.store(in_file, {}, 8000, np.zeros(10))
+
+    assert list(cache.cache_dir.iterdir()) == []
@@ -0,0 +1,72 @@
+""" Conversion of float data to PCM- and float32-formats """
+
+import numpy as np
+import pytest
+
+from sksound.sounds import convert_float
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(1234)
+    return rng.uniform(-1, 1, (40000, 2)) * 3
+
+
+@pytest.mark.parametrize('chunk_size', [1000, 2**16])
+def test_peak_normalisation(data, chunk_size):
+    converted = convert_float(data, level=0.5, chunk_size=chunk_size)
+
+    assert converted.dtype == np.int16
+    assert np.abs(converted).max() == 2**14
+    np.testing.assert_array_equal(converted, np.rint(data * 2**14 / np.abs(data).max()))
+
+
+def test_negative_peak():
+    # The peak is the largest absolute value, even if it is negative
+    data = np.array([0.1, -2.0, 0.5, 1.0])
+    converted = convert_float(data, level=1)
+
+    np.testing.assert_array_equal(converted, [1638, -32768, 8192, 16384])
+
+
+def test_rms_normalisation(data):
+    converted = convert_float(data, fmt='float32', normalize='rms', level=0.1)
+
+    assert converted.dtype == np.float32
+    assert np.sqrt(np.mean(converted.astype(np.float64)**2)) == pytest.approx(0.1, rel=1e-6)
+
+
+def test_int24_layout(data):
+    converted = convert_float(data, fmt='int24', level=0.5)
+
+    assert converted.dtype == np.int32
+    np.testing.assert_array_equal(converted & 0xFF, 0)
+    np.testing.assert_array_equal(converted >> 8, np.rint(data * 2**22 / np.abs(data).max()))
+
+
+@pytest.mark.parametrize('fmt, low, high', [('int16', -2**15, 2**15 - 1),
+                                            ('int24', -2**31, 2**31 - 2**8),
+                                            ('int32', -2**31, 2**31 - 1),
+                                            ('float32', -1, 1)])
+def test_clipping(fmt, low, high):
+    converted = convert_float(np.array([-4., -1., 0., 1., 4.]), fmt=fmt, normalize=None)
+
+    assert converted[0] == converted[1] == low
+    assert converted[2] == 0
+    assert converted[3] == converted[4] == high
+
+
+def test_silence():
+    np.testing.assert_array_equal(convert_float(np.zeros(100)), 0)
+
+
+def test_dither(data):
+    converted = convert_float(data, dither=True)
+    assert np.abs(converted - data * 2**13 / np.abs(data).max()).max() <= 1.5
+
+
+def test_unknown_options(data):
+    with pytest.raises(ValueError):
+        convert_float(data, fmt='int8')
+    with pytest.raises(ValueError):
+        convert_float(data, normalize='max')
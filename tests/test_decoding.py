@@ -0,0 +1,86 @@
+""" Decoding options of non-WAV files, with stand-ins for "ffmpeg" and "ffprobe" """
+
+import sys
+import json
+import types
+
+import numpy as np
+import pytest
+from scipy.io import wavfile
+
+from sksound import sounds
+from sksound.sounds import Sound
+
+
+FAKE_FFPROBE = '''
+import json
+print(json.dumps({'streams': [{'sample_rate': '44100', 'channels': 2}],
+                  'format': {'duration': '1.0'}}))
+'''
+
+# Writes one second of zeros in the requested format, and stores its arguments
+FAKE_FFMPEG = '''
+import sys, json
+import numpy as np
+args = sys.argv[1:]
+with open(__file__ + '.json', 'w') as out_file:
+    json.dump(args, out_file)
+rate = int(args[args.index('-ar') + 1])
+channels = int(args[args.index('-ac') + 1])
+dtype = {'s16le': '<i2', 'f32le': '<f4'}[args[args.index('-f') + 1]]
+sys.stdout.buffer.write(np.zeros(rate * channels, dtype=dtype).tobytes())
+'''
+
+
+@pytest.fixture
+def fake_ffmpeg(monkeypatch, tmp_path):
+    """ FFMPEG_info with Python scripts instead of the FFMPEG programs """
+
+    commands = {}
+    for (name, code) in [('ffmpeg', FAKE_FFMPEG), ('ffprobe', FAKE_FFPROBE)]:
+        script = tmp_path / (name + '.py')
+        script.write_text(code)
+        launcher = tmp_path / name
+        launcher.write_text('#!/bin/sh\nexec "{0}" "{1}" "$@"\n'.format(sys.executable, script))
+        launcher.chmod(0o755)
+        commands[name] = launcher
+
+    info = types.SimpleNamespace(ffmpeg=commands['ffmpeg'], ffprobe=commands['ffprobe'],
+                                 ffplay=None)
+    monkeypatch.setattr(sounds.FFMPEG_info, '_cached', info)
+    in_file = tmp_path / 'sound.mp3'
+    in_file.write_bytes(b'')
+    return (in_file, tmp_path / 'ffmpeg.py.json')
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='shell-script launchers')
+def test_options_are_passed_to_ffmpeg(fake_ffmpeg):
+    (in_file, args_file) = fake_ffmpeg
+    sound = Sound(in_file, rate=16000, channels=1, dtype='float32')
+
+    args = json.loads(args_file.read_text())
+    assert args[args.index('-ar') + 1] == '16000'
+    assert args[args.index('-ac') + 1] == '1'
+    assert args[args.index('-f') + 1] == 'f32le'
+    assert (sound.rate, sound.numChannels, sound.dataType) == (16000, 1, 'float32')
+    assert sound.totalSamples == 16000
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='shell-script launchers')
+def test_float_rate(fake_ffmpeg):
+    (in_file, args_file) = fake_ffmpeg
+    sound = Sound(in_file, rate=16000.0)
+
+    args = json.loads(args_file.read_text())
+    assert args[args.index('-ar') + 1] == '16000'
+    assert sound.rate == 16000 and isinstance(sound.rate, int)
+    assert sound.data.shape == (16000, 2)
+
+
+def test_wav_conversion(tmp_path):
+    data = np.int16(np.arange(8000*2).reshape(-1, 2) % 2000)
+    wavfile.write(tmp_path / 'stereo.wav', 8000, data)
+
+    sound = Sound(tmp_path / 'stereo.wav', rate=4000.0, channels=1)
+    assert sound.rate == 4000 and isinstance(sound.rate, int)
+    assert sound.data.shape == (4000,)
@@ -0,0 +1,78 @@
+""" Reading parts of WAV-files, with "start" and "stop" """
+
+import struct
+
+import numpy as np
+import pytest
+from scipy.io import wavfile
+
+from sksound.sounds import Sound, _read_wav_excerpt
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(1234)
+    return np.int16(rng.uniform(-1, 1, (40000, 2)) * 2**14)
+
+
+@pytest.fixture
+def wav_file(data, tmp_path):
+    wav_file = tmp_path / 'noise.wav'
+    wavfile.write(wav_file, 8000, data)
+    return wav_file
+
+
+@pytest.mark.parametrize('start, stop, first, last', [(None, None, 0, 40000),
+                                                      (1.0, 2.5, 8000, 20000),
+                                                      (None, 0.5, 0, 4000),
+                                                      (4.5, None, 36000, 40000),
+                                                      (-1.0, 10.0, 0, 40000),
+                                                      (2.0, 1.0, 16000, 16000)])
+def test_excerpt(data, wav_file, start, stop, first, last):
+    (rate, excerpt) = _read_wav_excerpt(wav_file, start, stop)
+
+    assert rate == 8000
+    assert excerpt.dtype == np.int16
+    np.testing.assert_array_equal(excerpt, data[first:last])
+
+
+@pytest.mark.parametrize('mmap', [False, True])
+def test_sound_excerpt(data, wav_file, mmap):
+    sound = Sound(wav_file, start=1.0, stop=2.5, mmap=mmap)
+
+    assert sound.totalSamples == 12000
+    assert sound.duration == pytest.approx(1.5)
+    np.testing.assert_array_equal(sound.data, data[8000:20000])
+    assert not sound._source_complete
+
+
+def test_mmap_excerpt_is_a_read_only_view(wav_file):
+    sound = Sound(wav_file, start=1.0, stop=2.5, mmap=True)
+
+    assert isinstance(sound.data, np.memmap)
+    assert not sound.data.flags.writeable
+
+
+def test_mono_excerpt(data, tmp_path):
+    wav_file = tmp_path / 'mono.wav'
+    wavfile.write(wav_file, 8000, data[:, 0])
+
+    (rate, excerpt) = _read_wav_excerpt(wav_file, 0.25, 0.75)
+    assert excerpt.shape == (4000,)
+    np.testing.assert_array_equal(excerpt, data[2000:6000, 0])
+
+
+def test_24bit_excerpt(data, tmp_path):
+    # 24-bit WAV-file, written by hand
+    samples = data.astype(np.int32) << 8
+    raw = samples.reshape(-1).view(np.uint8).reshape(-1, 4)[:, 1:].tobytes()
+    fmt = struct.pack('<HHIIHH', 1, 2, 8000, 8000*6, 6, 24)
+    wav_file = tmp_path / 'int24.wav'
+    wav_file.write_bytes(b'RIFF' + struct.pack('<I', 4 + 8 + len(fmt) + 8 + len(raw)) +
+                         b'WAVE' + b'fmt ' + struct.pack('<I', len(fmt)) + fmt +
+                         b'data' + struct.pack('<I', len(raw)) + raw)
+
+    (rate, excerpt) = _read_wav_excerpt(wav_file, 1.0, 1.5)
+    assert excerpt.dtype == np.int32
+    np.testing.assert_array_equal(excerpt, samples[8000:12000])
+    np.testing.assert_array_equal(excerpt, wavfile.read(wav_file)[1][8000:12000])
@@ -0,0 +1,34 @@
+""" Discovery of FFMPEG, without an installation """
+
+import json
+import threading
+
+import appdirs
+
+from sksound import sounds
+
+
+def test_first_discovery_without_ffmpeg(monkeypatch, tmp_path):
+    def not_found(*args, **kwargs):
+        raise FileNotFoundError
+
+    monkeypatch.setattr(appdirs, 'user_data_dir', lambda *args: str(tmp_path))
+    monkeypatch.setattr(sounds.subprocess, 'run', not_found)
+    monkeypatch.setattr(sounds.misc, 'askquestion', lambda **kwargs: False)
+    sounds.FFMPEG_info.clear_cache()
+
+    # "set" is called during the discovery, and must not dead-lock
+    result = []
+    thread = threading.Thread(target=lambda: result.append(sounds.FFMPEG_info.cached()),
+                              daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+    if thread.is_alive():
+        # Don't block the other tests with the lock that is still held
+        monkeypatch.setattr(sounds.FFMPEG_info, '_cache_lock', threading.RLock())
+    sounds.FFMPEG_info.clear_cache()
+
+    assert result, 'FFMPEG_info.cached() did not return'
+    assert result[0].ffmpeg is None
+    with open(tmp_path / 'ffmpeg.json') as in_file:
+        assert json.load(in_file) == {'ffmpeg': None, 'ffplay': None, 'ffprobe': None}
@@ -0,0 +1,75 @@
+""" Level metering: RMS, peak, and BS.1770 loudness """
+
+import numpy as np
+import pytest
+from scipy.io import wavfile
+
+from sksound.sounds import Sound, SoundStream, LoudnessMeter, _k_weighting
+
+
+def sine(duration=10., rate=48000, amplitude=1., freq=1000.):
+    t = np.arange(0, duration, 1/rate)
+    return amplitude * np.sin(2*np.pi*freq*t)
+
+
+def test_k_weighting_coefficients_at_48kHz():
+    # ITU-R BS.1770-4, Tables 1 and 2
+    np.testing.assert_allclose(_k_weighting(48000), [
+        [1.53512485958697, -2.69169618940638, 1.19839281085285,
+         1., -1.69065929318241, 0.73248077421585],
+        [1., -2., 1., 1., -1.99004745483398, 0.99007225036621]], atol=1e-12)
+
+
+def test_full_scale_sine():
+    # A 0 dBFS sine at 1 kHz in one channel gives -3.01 LUFS
+    loudness = Sound(inData=sine(), inRate=48000, dtype='float32').loudness()
+    assert loudness.integrated == pytest.approx(-3.01, abs=0.02)
+    np.testing.assert_allclose(loudness.shortTerm, -3.01, atol=0.02)
+
+
+def test_stereo_int16():
+    data = np.int16(np.stack([sine(), sine()], axis=1) * 2**14)
+    loudness = Sound(inData=data, inRate=48000).loudness()
+    assert loudness.integrated == pytest.approx(-6.02, abs=0.02)
+
+
+@pytest.mark.parametrize('block_size', [1000, 4800, 65536])
+def test_stream_matches_sound(block_size, tmp_path):
+    rng = np.random.default_rng(1234)
+    data = np.int16(rng.uniform(-1, 1, (48000*5, 2)) * 2**13)
+    data[:48000] //= 100            # quiet part, removed by the gating
+    wav_file = tmp_path / 'noise.wav'
+    wavfile.write(wav_file, 48000, data)
+
+    loudness = Sound(wav_file).loudness()
+    stream = SoundStream(wav_file)
+    meter = LoudnessMeter(stream.rate, stream.numChannels)
+    for block in stream.iter_blocks(block_size):
+        meter.process(block)
+
+    assert meter.integrated == pytest.approx(loudness.integrated, abs=1e-9)
+    np.testing.assert_allclose(meter.shortTerm, loudness.shortTerm, atol=1e-9)
+    np.testing.assert_allclose(meter.momentary, loudness.momentary, atol=1e-9)
+
+
+def test_rms_and_peak_of_frames():
+    rng = np.random.default_rng(1234)
+    data = np.int16(rng.uniform(-1, 1, (10000, 2)) * 2**14)
+    data[5] = -2**15
+    sound = Sound(inData=data, inRate=8000)
+
+    frames = np.lib.stride_tricks.sliding_window_view(data / 2**15, 1000, axis=0)[::300]
+    np.testing.assert_allclose(sound.rms(1000, 300)[1],
+                               np.sqrt(np.mean(frames**2, axis=-1)), atol=1e-12)
+    np.testing.assert_array_equal(sound.peak(1000, 300)[1],
+                                  np.abs(frames).max(axis=-1))
+
+
+def test_true_peak_exceeds_sample_peak():
+    # Samples at +-45 deg of a sine at rate/4 miss its maximum
+    n = np.arange(48000)
+    data = 0.5 * np.sin(2*np.pi*n/4 + np.pi/4)
+    sound = Sound(inData=data, inRate=48000, dtype='float32')
+
+    assert sound.peak(4800)[1].max() == pytest.approx(0.5/np.sqrt(2), abs=1e-6)
+    assert sound.peak(4800, true_peak=True)[1].max() == pytest.approx(0.5, abs=0.01)
@@ -0,0 +1,81 @@
+""" Mixing of several sounds into one """
+
+import numpy as np
+import pytest
+from scipy.io import wavfile
+
+from sksound.sounds import Sound, SoundStream, Mixer, Resampler
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(1234)
+    return np.int16(rng.uniform(-1, 1, (40000, 2)) * 2**14)
+
+
+def test_constant_power_pan(data):
+    mono = Sound(inData=data[:, 0], inRate=8000)
+    for pan in (-1, -0.5, 0, 0.3, 1):
+        mix = Mixer([(mono, 0, 1.0, pan)]).render().data
+
+        angle = (pan + 1) * np.pi/4
+        np.testing.assert_allclose(mix[:, 0], np.cos(angle) * data[:, 0] / 2**15, atol=1e-6)
+        np.testing.assert_allclose(mix[:, 1], np.sin(angle) * data[:, 0] / 2**15, atol=1e-6)
+        np.testing.assert_allclose(np.sum(mix**2, axis=1), (data[:, 0] / 2**15)**2,
+                                   atol=1e-6)
+
+
+def test_start_offsets(data):
+    sound = Sound(inData=data, inRate=8000)
+    mixer = Mixer([(sound, 0, 0.5, 0), (sound, 1.5, 0.25, 0)])
+    assert mixer.totalSamples == len(data) + 12000
+    assert mixer.duration == pytest.approx(6.5)
+
+    mix = mixer.render().data
+    expected = np.zeros((len(data) + 12000, 2))
+    expected[:len(data)] += 0.5 * data / 2**15
+    expected[12000:] += 0.25 * data / 2**15
+    np.testing.assert_allclose(mix, expected, atol=1e-6)
+
+
+def test_resampled_entry(data):
+    mixer = Mixer([(Sound(inData=data, inRate=8000), 0, 1.0, 0)], rate=16000)
+    mix = mixer.render(block_size=1000)
+
+    resampler = Resampler(8000, 16000)
+    expected = np.concatenate((resampler.process(data / 2**15), resampler.flush()))
+    assert mix.rate == 16000
+    assert mix.totalSamples == 2*len(data)
+    np.testing.assert_allclose(mix.data, expected[:2*len(data)], atol=1e-5)
+
+
+def test_int16_output_is_clipped(data):
+    sound = Sound(inData=data, inRate=8000)
+    mix = Mixer([(sound, 0, 2.0, 0), (sound, 0, 2.0, 0)]).render(fmt='int16')
+
+    assert mix.dataType == 'int16'
+    expected = np.clip(4 * data.astype(np.int32), -2**15, 2**15 - 1)
+    np.testing.assert_array_equal(mix.data, expected)
+    assert mix.data.max() == 2**15 - 1
+    assert mix.data.min() == -2**15
+
+
+@pytest.mark.parametrize('fmt', ['float32', 'int16'])
+def test_stream_matches_render(data, fmt, tmp_path):
+    wav_file = tmp_path / 'noise.wav'
+    wavfile.write(wav_file, 8000, data)
+
+    mixer = Mixer([(SoundStream(wav_file), 0, 0.7, 0.2),
+                   (Sound(inData=data[:, 0], inRate=8000), 0.3, 0.5, -0.4)])
+    rendered = mixer.render(fmt=fmt)
+    streamed = np.concatenate([block.copy() for block in mixer.render_stream(999, fmt)])
+
+    assert len(streamed) == mixer.totalSamples == len(data) + 2400
+    np.testing.assert_allclose(streamed, rendered.data, atol=1e-6)
+
+
+def test_unknown_length():
+    stream = Sound(inData=np.zeros(100, dtype=np.int16), inRate=8000)
+    stream.totalSamples = None
+    with pytest.raises(ValueError):
+        Mixer().add(stream)
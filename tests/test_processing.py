@@ -0,0 +1,76 @@
+""" Processing chains: block-wise, streamed, and in memory """
+
+import numpy as np
+import pytest
+from scipy.io import wavfile
+from scipy.signal import butter, sosfilt
+
+from sksound.sounds import (Sound, SoundStream, ProcessingChain, Gain, IIRFilter,
+                            Fade, Limiter)
+
+
+def make_stages():
+    return [IIRFilter(80, 'highpass', order=4), Gain(12, dB=True),
+            Fade(0.5, 1.0), Limiter(0.9)]
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(1234)
+    return np.int16(rng.uniform(-1, 1, (40000, 2)) * 2**14)
+
+
+@pytest.mark.parametrize('block_size', [1, 999, 2**16])
+def test_stream_matches_sound(data, block_size, tmp_path):
+    wav_file = tmp_path / 'noise.wav'
+    wavfile.write(wav_file, 8000, data)
+
+    processed = Sound(wav_file).process(make_stages())
+    chain = ProcessingChain(make_stages(), block_size=block_size)
+    streamed = np.concatenate([block.copy() for block in
+                               chain.process_stream(SoundStream(wav_file))])
+
+    assert processed.dataType == 'float32'
+    np.testing.assert_allclose(streamed, processed.data, atol=1e-6)
+
+
+def test_filter_and_gain(data):
+    processed = Sound(inData=data, inRate=8000).process(
+        ProcessingChain([IIRFilter(80, 'highpass', order=4), Gain(0.5)], block_size=1000))
+
+    sos = butter(4, 80, 'highpass', fs=8000, output='sos')
+    np.testing.assert_allclose(processed.data, 0.5*sosfilt(sos, data/2**15, axis=0),
+                               atol=1e-6)
+
+
+def test_fade(data):
+    processed = Sound(inData=data, inRate=8000).process([Fade(0.5, 1.0)])
+
+    np.testing.assert_array_equal(processed.data[0], 0)
+    np.testing.assert_allclose(processed.data[4000:-8000], data[4000:-8000] / 2**15)
+    assert np.all(np.abs(processed.data[-100:]) < 0.01)
+
+
+def test_limiter_bounds_the_output(data):
+    processed = Sound(inData=data, inRate=8000).process([Gain(4), Limiter(0.9)])
+    assert np.abs(processed.data).max() <= 0.9 * (1 + 1e-6)
+
+
+def test_empty_blocks():
+    chain = ProcessingChain(make_stages(), block_size=100)
+    chain.reset(8000, 1, 1000)
+    assert chain.process(np.zeros(0, dtype=np.int16)).shape == (0,)
+
+
+@pytest.mark.parametrize('dtype, scale, offset', [('uint8', 128, 128), ('int16', 2**15, 0),
+                                                  ('int32', 2**31, 0), ('float64', 1, 0)])
+def test_input_types(dtype, scale, offset):
+    rng = np.random.default_rng(1234)
+    block = (rng.uniform(-1, 1, (1000, 2)) * (scale - 1) + offset).astype(dtype)
+    chain = ProcessingChain([Gain(1)], block_size=1000)
+    chain.reset(8000, 2, 1000)
+
+    processed = chain.process(block)
+    assert processed.dtype == np.float32
+    np.testing.assert_allclose(processed, (block.astype(np.float64) - offset) / scale,
+                               rtol=1e-6)
@@ -0,0 +1,74 @@
+""" Recording with the hardware-free "LoopbackInput" """
+
+import numpy as np
+import pytest
+
+from sksound.sounds import Sound, Recorder, RingBuffer, LoopbackInput
+
+
+@pytest.fixture
+def signal():
+    return np.int16(np.arange(20000) % 30000 - 15000)
+
+
+def test_record_exact_data(signal, capsys):
+    recorded = Sound.record(0.5, rate=8000, stream_factory=LoopbackInput(signal))
+
+    assert recorded.rate == 8000
+    assert recorded.dataType == 'int16'
+    np.testing.assert_array_equal(recorded.data, signal[:4000])
+    assert 'dropped' not in capsys.readouterr().out
+
+
+def test_record_stereo_float32():
+    stereo = np.stack([np.linspace(-1, 1, 3000), np.linspace(1, -1, 3000)], axis=1)
+    recorded = Sound.record(0.25, rate=8000, numChannels=2, dtype='float32',
+                            stream_factory=LoopbackInput(stereo, loop=True))
+
+    assert recorded.data.shape == (2000, 2)
+    np.testing.assert_allclose(recorded.data, stereo[:2000], atol=1e-7)
+
+
+def test_record_short_signal(signal):
+    # The recording ends with the signal
+    recorded = Sound.record(5.0, rate=8000, stream_factory=LoopbackInput(signal[:1234]))
+    np.testing.assert_array_equal(recorded.data, signal[:1234])
+
+
+def test_iter_blocks_without_copy(signal):
+    recorder = Recorder(rate=8000, block_size=500, buffer_duration=5.,
+                        stream_factory=LoopbackInput(signal))
+    with recorder:
+        blocks = [block.copy() for block in recorder.iter_blocks(timeout=1.)]
+
+    assert all(len(block) == 500 for block in blocks)
+    np.testing.assert_array_equal(np.concatenate(blocks), signal)
+    assert recorder.overruns == 0
+
+
+def test_overruns_are_counted(signal, capsys):
+    # The buffer (200 samples) is much smaller than the signal, which is
+    # delivered before it is read
+    recorder = Recorder(rate=8000, block_size=100, buffer_duration=0.,
+                        stream_factory=LoopbackInput(signal))
+    recorder.start()
+    recorder._stream._thread.join()
+    received = sum(len(block) for block in recorder.iter_blocks(timeout=0.1))
+    recorder.stop()
+
+    assert received == 200
+    assert recorder.overruns == len(signal)//100 - 2
+    assert recorder.buffer.droppedSamples == len(signal) - received
+    assert 'dropped' in capsys.readouterr().out
+
+
+def test_ring_buffer_wraps_around():
+    ring = RingBuffer(10)
+    ring.write(np.arange(7))
+    np.testing.assert_array_equal(ring.read(5), np.arange(5))
+
+    assert ring.write(np.arange(7, 20)) == 8
+    assert (ring.overruns, ring.droppedSamples) == (1, 5)
+    assert len(ring.peek(10)) == 5             # up to the end of the buffer
+    np.testing.assert_array_equal(ring.read(10), np.arange(5, 15))
+    assert ring.available == 0
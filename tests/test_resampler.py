@@ -0,0 +1,66 @@
+""" Block-wise resampling gives the same result as "Sound.resample" """
+
+import numpy as np
+import pytest
+from scipy.signal import resample_poly
+
+from sksound.sounds import Sound, Resampler
+
+
+def noise(num_samples, num_channels=1):
+    rng = np.random.default_rng(1234)
+    shape = (num_samples,) if num_channels == 1 else (num_samples, num_channels)
+    return rng.uniform(-1, 1, shape).astype(np.float32)
+
+
+@pytest.mark.parametrize('rates', [(44100, 16000), (8000, 22050), (48000, 44100)])
+@pytest.mark.parametrize('block_size', [1, 100, 4096])
+def test_blocks_match_sound_resample(rates, block_size):
+    (rate, target_rate) = rates
+    data = noise(10000, 2)
+
+    sound = Sound(inData=data, inRate=rate, dtype='float32')
+    sound.resample(target_rate)
+
+    resampler = Resampler(rate, target_rate)
+    blocks = [resampler.process(data[start:start+block_size])
+              for start in range(0, len(data), block_size)]
+    resampled = np.concatenate(blocks + [resampler.flush()])
+
+    assert sound.rate == target_rate
+    assert resampled.shape == sound.data.shape
+    np.testing.assert_allclose(resampled, sound.data, atol=1e-5)
+
+
+def test_sound_resample_is_resample_poly():
+    data = noise(5000)
+    sound = Sound(inData=data, inRate=44100, dtype='float32')
+    sound.resample(16000)
+
+    np.testing.assert_allclose(sound.data, resample_poly(data, 160, 441), atol=1e-5)
+
+
+def test_integer_data_keep_their_type():
+    sound = Sound(inData=np.int16(noise(4000) * 2**14), inRate=8000)
+    sound.resample(16000)
+
+    assert sound.dataType == 'int16'
+    assert sound.totalSamples == 8000
+
+
+def test_same_rate_passes_data_through():
+    data = noise(1000, 2)
+    resampler = Resampler(16000, 16000)
+
+    resampled = np.concatenate([resampler.process(data[:600]), resampler.process(data[600:]),
+                                resampler.flush()])
+    np.testing.assert_array_equal(resampled, data)
+
+
+@pytest.mark.parametrize('target_rate', [16000, 8000])
+def test_flush_keeps_the_channels(target_rate):
+    resampler = Resampler(16000, target_rate)
+    output = [resampler.process(noise(1000, 2)), resampler.flush(), resampler.flush()]
+
+    assert all(block.shape[1:] == (2,) for block in output)
+    assert np.concatenate(output).shape == (1000 * target_rate // 16000, 2)
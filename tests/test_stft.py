@@ -0,0 +1,66 @@
+""" Short-time Fourier transform: in memory, block-wise, and cached """
+
+import numpy as np
+import pytest
+from scipy.io import wavfile
+from scipy.signal import get_window
+
+from sksound.sounds import Sound, SoundStream, STFT
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(1234)
+    return np.int16(rng.uniform(-1, 1, (10000, 2)) * 2**14)
+
+
+def test_frames_are_windowed_rffts(data):
+    sound = Sound(inData=data, inRate=8000)
+    (freqs, times, spectra) = sound.stft(frame_size=256, hop=64)
+
+    assert spectra.shape == ((len(data) - 256)//64 + 1, 129, 2)
+    assert spectra.dtype == np.complex64
+    np.testing.assert_allclose(freqs, np.fft.rfftfreq(256, 1/8000))
+    np.testing.assert_allclose(times[:2], np.array([128, 192]) / 8000)
+
+    window = get_window('hann', 256)
+    expected = np.fft.rfft(data[5*64:5*64+256, 1] / 2**15 * window)
+    np.testing.assert_allclose(spectra[5, :, 1], expected, atol=1e-5)
+
+
+@pytest.mark.parametrize('hop', [64, 256, 300])
+@pytest.mark.parametrize('block_size', [1, 270, 1000])
+def test_blocks_match_sound_stft(data, hop, block_size):
+    spectra = Sound(inData=data, inRate=8000).stft(frame_size=256, hop=hop)[2]
+
+    stft = STFT(8000, frame_size=256, hop=hop)
+    blocks = [stft.process(data[start:start+block_size])
+              for start in range(0, len(data), block_size)]
+
+    np.testing.assert_array_equal(np.concatenate(blocks), spectra)
+    assert stft.numFrames == len(spectra)
+
+
+def test_stream_matches_sound(data, tmp_path):
+    wav_file = tmp_path / 'noise.wav'
+    wavfile.write(wav_file, 8000, data)
+
+    spectra = Sound(wav_file).stft(frame_size=512)[2]
+    stream = SoundStream(wav_file)
+    stft = STFT(stream.rate, frame_size=512)
+    streamed = np.concatenate([stft.process(block) for block in stream.iter_blocks(777)])
+
+    np.testing.assert_array_equal(streamed, spectra)
+
+
+def test_results_are_cached_until_data_change(data):
+    sound = Sound(inData=data, inRate=8000)
+    first = sound.stft()
+
+    assert sound.stft() is first
+    assert sound.stft(hop=128) is not first
+
+    sound.data = -sound.data
+    second = sound.stft()
+    assert second is not first
+    np.testing.assert_allclose(second[2], -first[2], atol=1e-6)
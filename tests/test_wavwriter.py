@@ -0,0 +1,110 @@
+""" Incremental writing of WAV-files """
+
+import struct
+
+import numpy as np
+import pytest
+from scipy.io import wavfile
+
+from sksound.sounds import WavWriter
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(1234)
+    return np.int16(rng.uniform(-1, 1, (40000, 2)) * 2**14)
+
+
+def chunks(wav_file):
+    """ (id, size, offset) of the chunks of a RIFF-file """
+    raw = wav_file.read_bytes()
+    found = []
+    position = 12
+    while position + 8 <= len(raw):
+        (chunk_id, chunk_size) = struct.unpack('<4sI', raw[position:position+8])
+        found.append((chunk_id, chunk_size, position + 8))
+        position += 8 + chunk_size + chunk_size % 2
+    return found
+
+
+@pytest.mark.parametrize('block_size', [1, 999, 2**16])
+def test_header_sizes(data, block_size, tmp_path):
+    wav_file = tmp_path / 'noise.wav'
+    with WavWriter(wav_file, 8000, 2) as writer:
+        for start in range(0, len(data), block_size):
+            writer.write(data[start:start+block_size])
+    assert writer.totalSamples == len(data)
+
+    raw = wav_file.read_bytes()
+    assert raw[:4] == b'RIFF'
+    assert struct.unpack('<I', raw[4:8])[0] == len(raw) - 8
+    assert dict((chunk_id, size) for (chunk_id, size, _) in chunks(wav_file))[b'data'] \
+        == data.nbytes
+
+    (rate, read) = wavfile.read(wav_file)
+    assert rate == 8000
+    np.testing.assert_array_equal(read, data)
+
+
+def test_odd_data_size_is_padded(tmp_path):
+    wav_file = tmp_path / 'odd.wav'
+    data = np.arange(101, dtype=np.uint8)
+    with WavWriter(wav_file, 8000, 1, dtype='uint8') as writer:
+        writer.write(data)
+
+    raw = wav_file.read_bytes()
+    assert len(raw) % 2 == 0
+    assert struct.unpack('<I', raw[4:8])[0] == len(raw) - 8
+    (chunk_id, size, offset) = chunks(wav_file)[-1]
+    assert (chunk_id, size) == (b'data', 101)
+    assert offset + size + 1 == len(raw)
+    np.testing.assert_array_equal(wavfile.read(wav_file)[1], data)
+
+
+def test_fact_chunk_for_float(data, tmp_path):
+    wav_file = tmp_path / 'float.wav'
+    float_data = data.astype(np.float32) / 2**15
+    with WavWriter(wav_file, 8000, 2, dtype='float32') as writer:
+        writer.write(float_data[:1000])
+        writer.write(float_data[1000:])
+
+    raw = wav_file.read_bytes()
+    found = {chunk_id: (size, offset) for (chunk_id, size, offset) in chunks(wav_file)}
+    (size, offset) = found[b'fact']
+    assert size == 4
+    assert struct.unpack('<I', raw[offset:offset+4])[0] == len(data)
+    assert struct.unpack('<H', raw[found[b'fmt '][1]:found[b'fmt '][1]+2])[0] == 3
+
+    (rate, read) = wavfile.read(wav_file)
+    assert read.dtype == np.float32
+    np.testing.assert_array_equal(read, float_data)
+
+
+def test_no_fact_chunk_for_pcm(data, tmp_path):
+    wav_file = tmp_path / 'pcm.wav'
+    with WavWriter(wav_file, 8000, 2) as writer:
+        writer.write(data)
+    assert b'fact' not in [chunk_id for (chunk_id, _, _) in chunks(wav_file)]
+
+
+def test_safe_casts(data, tmp_path):
+    with WavWriter(tmp_path / 'int32.wav', 8000, 2, dtype='int32') as writer:
+        writer.write(data)
+    np.testing.assert_array_equal(wavfile.read(tmp_path / 'int32.wav')[1], data)
+
+    with WavWriter(tmp_path / 'int16.wav', 8000, 2) as writer:
+        with pytest.raises(TypeError):
+            writer.write(data.astype(np.int32))
+        with pytest.raises(TypeError):
+            writer.write(data.astype(np.float32))
+        with pytest.raises(ValueError):
+            writer.write(data[:, 0])
+    assert writer.totalSamples == 0
+
+
+def test_write_after_close(tmp_path):
+    writer = WavWriter(tmp_path / 'closed.wav', 8000, 1)
+    writer.close()
+    writer.close()
+    with pytest.raises(ValueError):
+        writer.write(np.zeros(10, dtype=np.int16))